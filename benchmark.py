@@ -0,0 +1,269 @@
+"""Reproducible benchmarks for PrimeList operations and find_primes.py command-line modes.
+
+Every case runs in a fresh process inside a temporary directory, so no primes cache from the
+working directory is read or written. Results are written as JSON, and can be compared against
+a saved baseline to catch regressions:
+
+	python benchmark.py --output baseline.json
+	python benchmark.py --baseline baseline.json
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+	import resource
+except ImportError:
+	# Not available on Windows; peak RSS is reported as null there
+	resource = None
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+import primelist
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "find_primes.py")
+FORMAT_VERSION = 1
+
+# Each case runs at least MIN_ITERATIONS times and keeps going until MIN_TIME seconds have
+# passed, but never past MAX_ITERATIONS
+MIN_ITERATIONS = 5
+MIN_TIME = 1.0
+MAX_ITERATIONS = 100000
+# A case regresses when its median latency exceeds the baseline's by more than this fraction
+DEFAULT_TOLERANCE = 0.10
+
+def fresh_list():
+	"""An empty PrimeList with no result cache that is never saved"""
+	return primelist.PrimeList(resultCacheSize=0)
+
+def random_primes(pl, rng, low, count):
+	"""count primes found after random starts in [low, 2 * low)"""
+	return [pl.FindNextPrime(rng.randrange(low, 2 * low)) for _ in range(count)]
+
+def random_semiprimes(pl, rng, digits, count):
+	"""count products of two random primes of the given number of digits"""
+	low = 10 ** (digits - 1)
+	return [p * q for p, q in zip(random_primes(pl, rng, low, count), random_primes(pl, rng, low, count))]
+
+def cycle(values):
+	"""Input function returning values in turn"""
+	return lambda i: values[i % len(values)]
+
+def clear_directory(i):
+	# Command-line cases start cold: the temporary working directory is emptied first
+	for name in os.listdir("."):
+		os.remove(name)
+
+def run_cli(*args):
+	subprocess.run([sys.executable, SCRIPT] + [str(arg) for arg in args], check=True, stdout=subprocess.DEVNULL)
+
+def run_batch_cli(values):
+	subprocess.run([sys.executable, SCRIPT, "--batch", "-"], input="\n".join(map(str, values)).encode(), check=True, stdout=subprocess.DEVNULL)
+
+def build_cases(quick):
+	"""Return (name, size, prepare) triples; prepare(pl, rng) sets up state outside the timing
+	and returns (call, inputs), where call(arg) is timed once per iteration on inputs(i)"""
+	cases = []
+	
+	def update_case(n):
+		def prepare(pl, rng):
+			return (lambda _: fresh_list().UpdatePrimesToValue(n)), cycle([None])
+		return prepare
+	for exponent in (5, 6) if quick else (5, 6, 7):
+		cases.append(("UpdatePrimesToValue", "1e{}".format(exponent), update_case(10 ** exponent)))
+	
+	def is_prime_case(n):
+		def prepare(pl, rng):
+			pl.UpdatePrimesToValue(math.isqrt(2 * n))
+			return pl.IsPrime, lambda i: rng.randrange(n, 2 * n) | 1
+		return prepare
+	for exponent in (6, 9) if quick else (6, 9, 12):
+		cases.append(("IsPrime", "1e{}".format(exponent), is_prime_case(10 ** exponent)))
+	
+	# Primes are the worst case for primality tests: every round runs
+	def primes_case(method, n):
+		def prepare(pl, rng):
+			return getattr(pl, method), cycle(random_primes(pl, rng, n, 64))
+		return prepare
+	for exponent in (12, 18, 30) if quick else (12, 18, 30, 100):
+		cases.append(("IsPrimeLarge", "1e{}".format(exponent), primes_case("IsPrimeLarge", 10 ** exponent)))
+	for exponent in (12, 18) if quick else (12, 18, 24):
+		cases.append(("MillerRabinTest", "1e{}".format(exponent), primes_case("MillerRabinTest", 10 ** exponent)))
+	for exponent in (8, 10) if quick else (8, 10, 12):
+		cases.append(("WheelFactorization", "1e{}".format(exponent), primes_case("WheelFactorization", 10 ** exponent)))
+	
+	def factors_case(digits):
+		def prepare(pl, rng):
+			return pl.GetPrimeFactors, cycle(random_semiprimes(pl, rng, digits, 16))
+		return prepare
+	for digits in (6, 9) if quick else (6, 9, 12):
+		cases.append(("GetPrimeFactors", "1e{}".format(2 * digits), factors_case(digits)))
+	
+	def next_prime_case(n, cached):
+		def prepare(pl, rng):
+			if cached:
+				pl.UpdatePrimesToValue(2 * n)
+			return pl.FindNextPrime, lambda i: rng.randrange(n, 2 * n)
+		return prepare
+	cases.append(("FindNextPrime", "1e6 cached", next_prime_case(10 ** 6, True)))
+	for exponent in (12, 18) if quick else (12, 18, 50):
+		cases.append(("FindNextPrime", "1e{}".format(exponent), next_prime_case(10 ** exponent, False)))
+	
+	def previous_prime_case(n):
+		def prepare(pl, rng):
+			return pl.FindPreviousPrime, lambda i: rng.randrange(n, 2 * n)
+		return prepare
+	for exponent in (12, 18) if quick else (12, 18, 50):
+		cases.append(("FindPreviousPrime", "1e{}".format(exponent), previous_prime_case(10 ** exponent)))
+	
+	def count_range_case(start, end):
+		def prepare(pl, rng):
+			return (lambda _: fresh_list().CountPrimesInRange(start, end)), cycle([None])
+		return prepare
+	for exponent in (6, 9) if quick else (6, 9, 11):
+		cases.append(("CountPrimesInRange", "1e{}".format(exponent), count_range_case(1, 10 ** exponent)))
+	cases.append(("CountPrimesInRange", "1e12 span 1e6", count_range_case(10 ** 12, 10 ** 12 + 10 ** 6)))
+	
+	def cli_case(*args):
+		def prepare(pl, rng):
+			return (lambda _: run_cli(*args)), clear_directory
+		return prepare
+	cases.append(("cli -c", "1e6", cli_case("-c", 1000003)))
+	cases.append(("cli -m --count-only", "1e6", cli_case("-m", 10 ** 6, "--count-only")))
+	cases.append(("cli -r", "1e10", cli_case("-r", 1, 10 ** 10)))
+	cases.append(("cli -n", "1e15", cli_case("-n", 10 ** 15)))
+	cases.append(("cli -f", "1e18", cli_case("-f", 1000000016000000063)))
+	
+	def batch_case(count):
+		def prepare(pl, rng):
+			values = [rng.randrange(10 ** 12) for _ in range(count)]
+			def inputs(i):
+				clear_directory(i)
+				return values
+			return run_batch_cli, inputs
+		return prepare
+	cases.append(("cli --batch", "1e4 values", batch_case(10 ** 4)))
+	return cases
+
+def percentile(samples, fraction):
+	"""Nearest-rank percentile of sorted samples"""
+	return samples[min(len(samples) - 1, max(0, math.ceil(fraction * len(samples)) - 1))]
+
+def peak_rss_kb():
+	if resource is None:
+		return None
+	peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+	# ru_maxrss is in bytes on macOS and kilobytes elsewhere
+	return peak // 1024 if sys.platform == "darwin" else peak
+
+def run_case(index, quick, seed, min_time):
+	"""Run one case in this (fresh) process and return its result entry"""
+	name, size, prepare = build_cases(quick)[index]
+	rng = random.Random("{}:{}:{}".format(seed, name, size))
+	home = os.getcwd()
+	with tempfile.TemporaryDirectory() as directory:
+		os.chdir(directory)
+		pl = fresh_list()
+		call, inputs = prepare(pl, rng)
+		samples = []
+		started = time.perf_counter()
+		while len(samples) < MAX_ITERATIONS and (len(samples) < MIN_ITERATIONS or time.perf_counter() - started < min_time):
+			arg = inputs(len(samples))
+			begin = time.perf_counter_ns()
+			call(arg)
+			samples.append(time.perf_counter_ns() - begin)
+		os.chdir(home)
+	samples.sort()
+	total = sum(samples)
+	return {
+		"name": name,
+		"size": size,
+		"iterations": len(samples),
+		"throughput": len(samples) / (total / 1e9) if total else None,
+		"latency_us": {
+			"mean": total / len(samples) / 1000,
+			"p50": percentile(samples, 0.50) / 1000,
+			"p90": percentile(samples, 0.90) / 1000,
+			"p99": percentile(samples, 0.99) / 1000,
+			"max": samples[-1] / 1000,
+		},
+		"peak_rss_kb": peak_rss_kb(),
+	}
+
+def compare(results, baseline, tolerance):
+	"""Print each case's median latency against the baseline; return the regressed cases"""
+	previous = {(entry["name"], entry["size"]): entry for entry in baseline["results"]}
+	regressions = []
+	for entry in results:
+		old = previous.get((entry["name"], entry["size"]))
+		if old is None:
+			continue
+		ratio = entry["latency_us"]["p50"] / old["latency_us"]["p50"]
+		regressed = ratio > 1 + tolerance
+		if regressed:
+			regressions.append(entry)
+		print("{:<24} {:<14} {:>12.1f} us  {:>6.2f}x{}".format(entry["name"], entry["size"], entry["latency_us"]["p50"], ratio, "  REGRESSION" if regressed else ""), file=sys.stderr)
+	return regressions
+
+def ParseArgs():
+	parser = argparse.ArgumentParser(description='Benchmark PrimeList operations and find_primes.py modes.')
+	parser.add_argument('--output', dest='output', metavar='FILE', help='Write the JSON results to FILE instead of stdout.')
+	parser.add_argument('--baseline', dest='baseline', metavar='FILE', help='Compare median latencies with a saved run; exit with status 1 on a regression.')
+	parser.add_argument('--tolerance', dest='tolerance', type=float, default=DEFAULT_TOLERANCE, help='Allowed slowdown against the baseline as a fraction (default {}).'.format(DEFAULT_TOLERANCE))
+	parser.add_argument('--filter', dest='filter', metavar='TEXT', help='Only run cases whose name contains TEXT.')
+	parser.add_argument('--quick', dest='quick', action='store_true', help='Skip the largest input sizes.')
+	parser.add_argument('--min-time', dest='minTime', type=float, default=MIN_TIME, help='Seconds each case keeps iterating for (default {}).'.format(MIN_TIME))
+	parser.add_argument('--seed', dest='seed', type=int, default=0, help='Seed for the generated inputs (default 0).')
+	return parser.parse_args()
+
+def main():
+	args = ParseArgs()
+	cases = build_cases(args.quick)
+	selected = [i for i, (name, size, _) in enumerate(cases) if not args.filter or args.filter in name]
+	results = []
+	# A new process per case keeps peak RSS and warm caches from leaking between cases
+	context = multiprocessing.get_context("spawn")
+	for i in selected:
+		with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+			entry = pool.submit(run_case, i, args.quick, args.seed, args.minTime).result()
+		print("{:<24} {:<14} {:>12.1f} us p50  {:>10.1f} ops/s".format(entry["name"], entry["size"], entry["latency_us"]["p50"], entry["throughput"]), file=sys.stderr)
+		results.append(entry)
+	
+	report = {
+		"version": FORMAT_VERSION,
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"numpy": numpy.__version__ if numpy is not None else None,
+		"seed": args.seed,
+		"quick": args.quick,
+		"results": results,
+	}
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(report, f, indent=2)
+	else:
+		json.dump(report, sys.stdout, indent=2)
+		print()
+	
+	if args.baseline:
+		with open(args.baseline, 'r') as f:
+			baseline = json.load(f)
+		print("\n--- Against {} ---".format(args.baseline), file=sys.stderr)
+		if compare(results, baseline, args.tolerance):
+			return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
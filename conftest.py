@@ -0,0 +1,7 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+	# Cache files live in the working directory
+	monkeypatch.chdir(tmp_path)
+	return tmp_path
@@ -0,0 +1,14 @@
+"""Prime number toolkit: PrimeList keeps a cache of sieved primes on disk and answers primality,
+next/previous prime, counting and factorization queries from it.
+
+	from primelist import PrimeList
+	with PrimeList() as pl:
+		pl.CountPrimesInRange(1, 10 ** 9)
+
+Importing is cheap and has no side effects; the command line lives in primelist.cli.
+"""
+from .core import (CancelToken, FactorPool, InterruptException, PrimeList, PrimeListInitializationError,
+	PrimeStore, ResultCache, WheelStore)
+
+__all__ = ["CancelToken", "FactorPool", "InterruptException", "PrimeList", "PrimeListInitializationError",
+	"PrimeStore", "ResultCache", "WheelStore"]
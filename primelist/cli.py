@@ -0,0 +1,605 @@
+"""Command-line interface: python -m primelist, or find_primes.py"""
+import argparse
+import math
+import os
+import queue
+import signal
+import stat
+import sys
+import threading
+import time
+
+from .core import (BATCH_SIZE, BITMAP_FILE, CACHE_FILE, RESULT_CACHE_FILE, RESULT_CACHE_SIZE, CancelToken,
+	FactorPool, InterruptException, PrimeList)
+
+# cProfile statistics written by --profile
+PROFILE_FILE = "find_primes.pstats"
+
+# Seconds before progress is first drawn, and the least time between redraws
+PROGRESS_DELAY = 1.0
+PROGRESS_INTERVAL = 0.1
+
+# Seconds between cache checkpoints in --serve mode
+SERVER_CHECKPOINT_INTERVAL = 60.0
+
+# Compute threads in --serve mode; they share one CPU under the GIL, so they keep requests from
+# queueing behind each other rather than add throughput
+SERVER_THREADS = 16
+
+def ParseArgs():
+	parser = argparse.ArgumentParser(description='Generate a list of prime numbers.')
+	
+	# Optional Arguments
+	parser.add_argument('-m', '--max', dest='isMax', action='store_true', help='Use <value> to find all primes from 1 to <value>.')
+	parser.add_argument('-c', '--check', dest='isCheck', action='store_true', help='Determine if <value> is a prime number.')
+	parser.add_argument('-t', '--top', dest='isHighest', action='store_true', help='Display the highest prime number saved in the primes cache.')
+	parser.add_argument('-l', '--large', dest='isLarge', action='store_true', help='Use optimized algorithms for large numbers (>10M).')
+	parser.add_argument('-n', '--next', dest='isNext', action='store_true', help='Find the next prime number after <value>.')
+	parser.add_argument('-p', '--prev', dest='isPrev', action='store_true', help='Find the previous prime number before <value>.')
+	parser.add_argument('-r', '--range', dest='isRange', action='store_true', help='Count primes in range from <value> to <end_value>.')
+	parser.add_argument('-f', '--factors', dest='isFactors', action='store_true', help='Get prime factorization of <value>.')
+	parser.add_argument('--nth', dest='isNth', action='store_true', help='Find the <value>-th prime (the 1st is 2).')
+	parser.add_argument('--pi', dest='isPi', action='store_true', help='Count the primes up to <value>.')
+	parser.add_argument('--list-range', dest='listRange', type=int, nargs=2, metavar=('START', 'END'), help='Stream every prime from START to END.')
+	parser.add_argument('--gaps', dest='gapRange', type=int, nargs=2, metavar=('START', 'END'), help='Report prime gaps and twin/cousin/sexy prime counts from START to END.')
+	parser.add_argument('--histogram', dest='histogram', action='store_true', help='With --gaps, also list how often each gap occurs and where it first occurs.')
+	parser.add_argument('--first-gap', dest='firstGap', type=int, metavar='GAP', help='Find the first prime followed by a gap of GAP, searching from <value> (default 2) up to <end_value> (default unbounded).')
+	parser.add_argument('--count-only', dest='countOnly', action='store_true', help='With -m or --list-range, print only how many primes were found.')
+	parser.add_argument('--output', dest='output', metavar='FILE', help='With -m or --list-range, write the primes to FILE instead of stdout.')
+	parser.add_argument('--batch', dest='batch', metavar='FILE', help='Check every integer in FILE (one per line, - for stdin) and stream the results; with -f, print each factorization instead.')
+	parser.add_argument('--serve', dest='serve', metavar='ADDRESS', help='Keep the primes cache loaded and answer JSON requests on a Unix socket path or [host:]port.')
+	parser.add_argument('--result-cache', dest='resultCache', type=int, default=RESULT_CACHE_SIZE, metavar='SIZE', help='Number of large-query answers kept for reuse (default {}, 0 disables).'.format(RESULT_CACHE_SIZE))
+	parser.add_argument('--keep-results', dest='keepResults', action='store_true', help='Keep the large-query answers in {} between runs.'.format(RESULT_CACHE_FILE))
+	parser.add_argument('--bitmap', dest='bitmap', action='store_true', help='Keep the primes cache as a wheel-30 bitmap in {} (one byte per 30 integers).'.format(BITMAP_FILE))
+	parser.add_argument('--workers', dest='workers', type=int, default=1, help='Number of processes used to sieve -m and -r ranges, or to factor hard cofactors with -f --batch (default 1).')
+	parser.add_argument('--timing', dest='showTiming', action='store_true', help='Display timing information for calculations and display.')
+	parser.add_argument('--stats', dest='stats', action='store_true', help='Write operation counters and load/compute/format/persist timings to stderr as JSON.')
+	parser.add_argument('--profile', dest='profile', action='store_true', help='Run under cProfile and write the statistics to {}.'.format(PROFILE_FILE))
+	
+	# Required (positional) Arguments - only needed for -m and -c options
+	parser.add_argument('value', type=int, nargs='?', help='Integer value to use for prime number operations (required for -m, -c, -n, -p, -f options).')
+	parser.add_argument('end_value', type=int, nargs='?', help='End value for range operations (required for -r option).')
+	
+	return parser.parse_args()
+
+def read_chunks(inputFile, cancel=None):
+	"""Yield the non-empty lines of inputFile in lists of at most BATCH_SIZE. A list is cut short
+	rather than wait for input that has not arrived, so a slow producer gets each answer as soon as
+	its line is in; a background thread does the blocking reads"""
+	lines = queue.Queue(4 * BATCH_SIZE)
+	
+	def reader():
+		try:
+			for line in inputFile:
+				line = line.strip()
+				if line:
+					lines.put(line)
+			lines.put(None)
+		except Exception as err:
+			# Raised again on the main thread
+			lines.put(err)
+	threading.Thread(target=reader, daemon=True).start()
+	
+	while True:
+		# Wait in short steps so cancellation stays responsive
+		try:
+			line = lines.get(timeout=0.1)
+		except queue.Empty:
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			continue
+		chunk = []
+		while line is not None:
+			if isinstance(line, Exception):
+				raise line
+			chunk.append(line)
+			if len(chunk) >= BATCH_SIZE:
+				break
+			try:
+				line = lines.get_nowait()
+			except queue.Empty:
+				break
+		if chunk:
+			yield chunk
+		if line is None:
+			return
+
+def run_batch(pl, source, factors=False, workers=1, cancel=None):
+	"""Stream "<value> <True|False>" lines, or "<value> [factors]" with factors set, for each
+	integer in source ('-' for stdin)"""
+	inputFile = sys.stdin if source == '-' else open(source, 'r')
+	# One pool of factoring processes serves every chunk
+	pool = FactorPool(workers) if factors and workers > 1 else None
+	try:
+		for chunk in read_chunks(inputFile, cancel):
+			numbers = []
+			for line in chunk:
+				try:
+					numbers.append(int(line))
+				except ValueError:
+					numbers.append(None)
+			valid = [num for num in numbers if num is not None]
+			if factors:
+				results = pl.GetPrimeFactorsBatch(valid, cancel=cancel, pool=pool)
+			else:
+				results = pl.IsPrimeBatch(valid, cancel)
+			output = []
+			for line, num in zip(chunk, numbers):
+				if num is None:
+					output.append("{} invalid".format(line))
+				else:
+					output.append("{} {}".format(num, next(results)))
+			sys.stdout.write("\n".join(output) + "\n")
+			sys.stdout.flush()
+		return 0
+	except InterruptException:
+		sys.stderr.write("Calculation interrupted.\n")
+		return -1
+	finally:
+		if pool is not None:
+			pool.Close()
+		if inputFile is not sys.stdin:
+			inputFile.close()
+
+def handle_request(pl, request, cancel=None):
+	"""Answer one --serve request, e.g. {"op": "range", "start": 10, "end": 100}"""
+	op = request.get("op")
+	if op == "check":
+		return next(pl.IsPrimeBatch([int(request["value"])], cancel))
+	if op == "next":
+		return pl.FindNextPrime(int(request["value"]), cancel=cancel)
+	if op == "prev":
+		return pl.FindPreviousPrime(int(request["value"]), cancel=cancel)
+	if op == "range":
+		return pl.CountPrimesInRange(int(request["start"]), int(request["end"]), cancel=cancel)
+	if op == "factor":
+		return pl.GetPrimeFactors(int(request["value"]), cancel)
+	if op == "stats":
+		return pl.ResultCacheStats()
+	raise ValueError("Unknown op: {!r}".format(op))
+
+def answer_from_store(pl, request):
+	"""The answer to a --serve request that the loaded store already holds, or None when it has to be
+	computed"""
+	op = request.get("op")
+	if op == "stats":
+		return pl.ResultCacheStats()
+	if op not in ("check", "next", "prev"):
+		return None
+	value = int(request["value"])
+	if op == "check" and value <= pl.GetVerifiedBound():
+		return pl.IsInPrimeList(value)
+	if op == "next" and value < pl.GetMax():
+		return pl.FindNextPrime(value)
+	if op == "prev" and 2 < value <= pl.GetVerifiedBound():
+		return pl.FindPreviousPrime(value)
+	return None
+
+def serve(pl, address, cancel):
+	"""Answer line-delimited JSON requests on a Unix socket path or [host:]port until cancel is cancelled
+	(Ctrl+C); requests still running then are interrupted"""
+	import asyncio
+	import json
+	from concurrent.futures import ThreadPoolExecutor
+	
+	async def run_server():
+		loop = asyncio.get_running_loop()
+		# Lookups in the store are answered on the event loop; the rest run on compute threads, so a
+		# long factorization holds up only the connection that asked for it
+		compute = ThreadPoolExecutor(max_workers=SERVER_THREADS)
+		# Searches past the store change the side index, which only one thread may do at a time
+		sideIndex = threading.Lock()
+		# Cancel tokens of the requests on compute threads
+		running = set()
+		
+		def compute_answer(request, token):
+			if request.get("op") in ("next", "prev"):
+				with sideIndex:
+					return handle_request(pl, request, token)
+			return handle_request(pl, request, token)
+		
+		async def answer(request):
+			result = answer_from_store(pl, request)
+			if result is not None:
+				return result
+			token = CancelToken()
+			if cancel.cancelled:
+				token.Cancel()
+			running.add(token)
+			try:
+				return await loop.run_in_executor(compute, compute_answer, request, token)
+			finally:
+				running.discard(token)
+		
+		async def handle_client(reader, writer):
+			try:
+				while True:
+					line = await reader.readline()
+					if not line:
+						break
+					requestId = None
+					try:
+						request = json.loads(line)
+						requestId = request.get("id")
+						response = {"id": requestId, "result": await answer(request)}
+					except InterruptException:
+						response = {"id": requestId, "error": "Calculation interrupted"}
+					except KeyError as err:
+						response = {"id": requestId, "error": "Missing field: {}".format(err.args[0])}
+					except Exception as err:
+						# Whatever went wrong, the client gets an answer and the connection stays open
+						response = {"id": requestId, "error": str(err) or type(err).__name__}
+					writer.write((json.dumps(response) + "\n").encode())
+					await writer.drain()
+			except ConnectionError:
+				pass
+			finally:
+				writer.close()
+		
+		# Load the cache before taking requests, so that no two threads load it
+		pl.GetVerifiedBound()
+		host, _, port = address.rpartition(":")
+		if port.isdigit():
+			server = await asyncio.start_server(handle_client, host or "127.0.0.1", int(port))
+		else:
+			if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+				# Left behind by a server that did not shut down cleanly
+				os.remove(address)
+			server = await asyncio.start_unix_server(handle_client, address)
+		print("Serving on {} (Press Ctrl+C to stop)".format(address), flush=True)
+		
+		async with server:
+			lastCheckpoint = time.time()
+			while not cancel.cancelled:
+				await asyncio.sleep(0.2)
+				# Persist new primes periodically instead of on every request. Saving swaps the store's
+				# arrays, so it runs on the event loop while no compute thread is reading them
+				if time.time() - lastCheckpoint >= SERVER_CHECKPOINT_INTERVAL and not running:
+					pl.Save()
+					lastCheckpoint = time.time()
+			while running:
+				for token in running:
+					token.Cancel()
+				await asyncio.sleep(0.05)
+		pl.Save()
+		compute.shutdown()
+		if not port.isdigit() and os.path.exists(address):
+			os.remove(address)
+	
+	asyncio.run(run_server())
+	return 0
+
+def format_time(seconds):
+	"""Format time in hours:minutes:seconds:hundredths format"""
+	# Round up to nearest 1/100th of a second
+	seconds = math.ceil(seconds * 100) / 100
+	
+	hours = int(seconds // 3600)
+	minutes = int((seconds % 3600) // 60)
+	secs = int(seconds % 60)
+	hundredths = int((seconds * 100) % 100)
+	
+	return f"{hours:02d}:{minutes:02d}:{secs:02d}:{hundredths:02d}"
+
+class ProgressReporter():
+	"""progress(done, total) callback for the compute loops: draws one status line with percentage,
+	rate and ETA on a terminal, nothing for the first PROGRESS_DELAY seconds and then at most once
+	every PROGRESS_INTERVAL seconds. Loops call it once per segment, so between renders a call costs
+	one clock read and no thread is needed"""
+	def __init__(self, stream=sys.stderr):
+		self._stream = stream
+		self._started = time.perf_counter()
+		self._nextRender = self._started + PROGRESS_DELAY
+		# Width of the line on screen, 0 while nothing is drawn
+		self._width = 0
+		# Only a terminal can have its line redrawn
+		self._enabled = stream.isatty()
+	
+	def __call__(self, done: int, total: int = None):
+		now = time.perf_counter()
+		if now < self._nextRender or not self._enabled:
+			return
+		self._nextRender = now + PROGRESS_INTERVAL
+		elapsed = now - self._started
+		rate = done / elapsed
+		line = "Processing... {}/s".format(format_count(rate))
+		if total:
+			line = "Processing... {:.0%} {}/s".format(done / total, format_count(rate))
+			if rate > 0:
+				line += " ETA {}".format(format_time((total - done) / rate))
+		line += " Elapsed {} (Press Ctrl+C to interrupt)".format(format_time(elapsed))
+		self._stream.write("\r" + line.ljust(self._width))
+		self._stream.flush()
+		self._width = len(line)
+	
+	def Clear(self):
+		"""Erase the status line, if one was drawn"""
+		if self._width:
+			self._stream.write("\r" + " " * self._width + "\r")
+			self._stream.flush()
+			self._width = 0
+
+def note_other_cache(pl, bitmap):
+	"""Point out a cache in the other format (CACHE_FILE or BITMAP_FILE) holding more primes than this one"""
+	if bitmap and not os.path.isfile(BITMAP_FILE):
+		# The bitmap is converted from CACHE_FILE on first use
+		return
+	other = pl.StoredBound(not bitmap)
+	if other > pl.StoredBound(bitmap):
+		used, unused, hint = (BITMAP_FILE, CACHE_FILE, "run without --bitmap") if bitmap else (CACHE_FILE, BITMAP_FILE, "add --bitmap")
+		print("Note: {} holds primes up to {}, further than {}; {} to use it.".format(unused, other, used, hint), file=sys.stderr)
+
+def discard_stdout():
+	"""After a BrokenPipeError: the reader went away (e.g. piped into head), so send the rest of stdout,
+	including what is still buffered, to the null device and let the command stop quietly"""
+	os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+def format_count(value):
+	"""Format a rate or count with a k/M/G suffix"""
+	for suffix, scale in (("G", 1e9), ("M", 1e6), ("k", 1e3)):
+		if value >= scale:
+			return "{:.1f}{}".format(value / scale, suffix)
+	return "{:.0f}".format(value)
+
+def main():
+	args = ParseArgs()
+	if not args.isMax and not args.isCheck and not args.isHighest and not args.isNext and not args.isPrev and not args.isRange and not args.isFactors and not args.isNth and not args.isPi and not args.listRange and not args.gapRange and args.firstGap is None and not args.batch and not args.serve:
+		print("Please provide an optional argument (-m, -c, -t, -l, -n, -p, -r, -f, --nth, --pi, --list-range, --gaps, --first-gap, --batch, or --serve) for use with <value>.")
+		return -1
+	
+	# Ctrl+C cancels the running command, which then reports its partial result
+	cancel = CancelToken()
+	signal.signal(signal.SIGINT, lambda signum, frame: cancel.Cancel())
+	
+	# New primes are saved when the block is left, however the command ends, and checkpointed during long sieves
+	with PrimeList(args.resultCache, args.keepResults, args.bitmap, checkpoints=True, counters=args.stats) as pl:
+		note_other_cache(pl, args.bitmap)
+		if args.profile:
+			import cProfile
+			profiler = cProfile.Profile()
+			try:
+				status = profiler.runcall(run_command, args, pl, cancel)
+			finally:
+				profiler.dump_stats(PROFILE_FILE)
+				print("Profile written to {}".format(PROFILE_FILE), file=sys.stderr)
+		else:
+			status = run_command(args, pl, cancel)
+		
+		if args.stats:
+			import json
+			# Save before reporting so the persist phase is part of the report
+			pl.Save()
+			print(json.dumps(pl.Stats(), indent=2, sort_keys=True), file=sys.stderr)
+	return status
+
+def run_command(args, pl, cancel):
+	"""Run the operation selected on the command line"""
+	start_time = time.time()
+	
+	if args.batch:
+		return run_batch(pl, args.batch, args.isFactors, args.workers, cancel)
+	
+	if args.serve:
+		return serve(pl, args.serve, cancel)
+	
+	# Track calculation start time; a cache load inside the calculation is reported separately
+	calc_start_time = time.time()
+	load_before = pl.Stats()["timings"].get("load", 0.0)
+	
+	# Streamed prime listings own the terminal, so no progress is drawn over them
+	streaming = (args.isMax or args.listRange) and not args.countOnly and not args.output
+	progress = None if streaming else ProgressReporter()
+	
+	if args.isHighest:
+		if not pl._list:
+			result = "No prime numbers found in the primes cache."
+		else:
+			highest_prime = pl.GetMax()
+			result = "Highest prime number: {}".format(highest_prime)
+	
+	if args.isCheck:
+		if args.value is None:
+			print("Error: <value> is required for the -c/--check option.")
+			return -1
+		
+		try:
+			if args.isLarge or args.value > 10000000:
+				is_prime = pl.IsPrimeLarge(args.value, cancel)
+				# If the number is prime and not already in our list, add it
+				if is_prime and not pl.IsInPrimeList(args.value):
+					pl.AppendValue(args.value)
+				result = "Is {} prime? {}".format(args.value, is_prime)
+			else:
+				sqrVal = math.isqrt(args.value)
+				pl.UpdatePrimesToValue(sqrVal, progress, cancel=cancel)
+				is_prime = pl.IsPrime(args.value, cancel)
+				result = "Is {} prime? {}".format(args.value, is_prime)
+		except InterruptException:
+			result = "Calculation interrupted. Partial result: Unable to determine if {} is prime.".format(args.value)
+	
+	if args.isMax or args.listRange:
+		if args.isMax and args.value is None:
+			print("Error: <value> is required for the -m/--max option.")
+			return -1
+		if args.isMax:
+			start, end = 2, args.value
+			header = "List of prime numbers:"
+		else:
+			start, end = sorted(args.listRange)
+			header = "Prime numbers between {} and {}:".format(start, end)
+		
+		# Primes are written segment by segment as the sieve completes them, never collected in one string
+		out = open(args.output, 'w') if args.output else sys.stdout
+		count = 0
+		lastPrime = None
+		try:
+			if out is sys.stdout and not args.countOnly:
+				print(header, flush=True)
+			for chunk in pl.IterPrimes(start, end, progress, args.workers, cancel):
+				if not len(chunk):
+					continue
+				count += len(chunk)
+				lastPrime = chunk[-1]
+				if not args.countOnly:
+					out.write("\n".join(map(str, chunk)) + "\n")
+					out.flush()
+			if args.countOnly:
+				result = "Number of primes between {} and {}: {}".format(start, end, count)
+			elif out is not sys.stdout:
+				result = "Wrote {} primes to {}.".format(count, args.output)
+			else:
+				result = None
+		except InterruptException:
+			result = "Calculation interrupted. Partial result - {} primes found up to {}.".format(count, lastPrime)
+		except BrokenPipeError:
+			discard_stdout()
+			result = None
+		finally:
+			if out is not sys.stdout:
+				out.close()
+	
+	if args.isNext:
+		if args.value is None:
+			print("Error: <value> is required for the -n/--next option.")
+			return -1
+		
+		try:
+			next_prime = pl.FindNextPrime(args.value, progress, cancel)
+			result = "Next prime after {}: {}".format(args.value, next_prime)
+		except InterruptException:
+			result = "Calculation interrupted. Unable to find next prime after {}.".format(args.value)
+	
+	if args.isPrev:
+		if args.value is None:
+			print("Error: <value> is required for the -p/--prev option.")
+			return -1
+		
+		try:
+			prev_prime = pl.FindPreviousPrime(args.value, progress, cancel)
+			if prev_prime is None:
+				result = "No prime number exists before {}.".format(args.value)
+			else:
+				result = "Previous prime before {}: {}".format(args.value, prev_prime)
+		except InterruptException:
+			result = "Calculation interrupted. Unable to find previous prime before {}.".format(args.value)
+	
+	if args.isRange:
+		if args.value is None or args.end_value is None:
+			print("Error: Both <value> and <end_value> are required for the -r/--range option.")
+			return -1
+		if args.value > args.end_value:
+			args.value, args.end_value = args.end_value, args.value
+		
+		try:
+			count = pl.CountPrimesInRange(args.value, args.end_value, progress, args.workers, cancel)
+			result = "Number of primes between {} and {}: {}".format(args.value, args.end_value, count)
+		except InterruptException as err:
+			if err.partial is None:
+				result = "Calculation interrupted. Unable to count primes in range {} to {}.".format(args.value, args.end_value)
+			else:
+				result = "Calculation interrupted. Partial result: Found {} primes in range {} to {}.".format(err.partial, args.value, args.end_value)
+	
+	if args.isFactors:
+		if args.value is None:
+			print("Error: <value> is required for the -f/--factors option.")
+			return -1
+		
+		try:
+			factors = pl.GetPrimeFactors(args.value, cancel, progress)
+			if factors:
+				result = "Prime factors of {}: {}".format(args.value, factors)
+			else:
+				result = "{} has no prime factors.".format(args.value)
+		except InterruptException:
+			result = "Calculation interrupted. Unable to determine prime factors of {}.".format(args.value)
+	
+	if args.isNth:
+		if args.value is None:
+			print("Error: <value> is required for the --nth option.")
+			return -1
+		
+		try:
+			prime = pl.NthPrime(args.value, progress, cancel)
+			if prime is None:
+				result = "There is no prime number {}; counting starts at 1.".format(args.value)
+			else:
+				result = "Prime number {}: {}".format(args.value, prime)
+		except InterruptException:
+			result = "Calculation interrupted. Unable to find prime number {}.".format(args.value)
+	
+	if args.isPi:
+		if args.value is None:
+			print("Error: <value> is required for the --pi option.")
+			return -1
+		
+		try:
+			count = pl.PrimePi(args.value, progress, cancel)
+			result = "Number of primes up to {}: {}".format(args.value, count)
+		except InterruptException:
+			result = "Calculation interrupted. Unable to count primes up to {}.".format(args.value)
+	
+	if args.gapRange:
+		start, end = sorted(args.gapRange)
+		try:
+			stats = pl.PrimeGapStats(start, end, progress, args.workers, cancel)
+			lines = ["Prime gaps between {} and {}:".format(start, end), "Primes: {}".format(stats["primes"])]
+			if stats["maxGap"] is not None:
+				lines.append("Largest gap: {} (after {})".format(stats["maxGap"], stats["maxGapAfter"]))
+				lines.append("Mean gap: {:.4f}".format(stats["meanGap"]))
+			lines.append("Twin primes (p, p+2): {}".format(stats["twins"]))
+			lines.append("Cousin primes (p, p+4): {}".format(stats["cousins"]))
+			lines.append("Sexy primes (p, p+6): {}".format(stats["sexy"]))
+			if args.histogram:
+				lines.append("Gap  Count  First after")
+				for gap, count in stats["histogram"].items():
+					lines.append("{}  {}  {}".format(gap, count, stats["firstOccurrence"][gap]))
+			# Written here like a prime listing, since the reader may stop early (e.g. head)
+			if progress:
+				progress.Clear()
+			sys.stdout.write("\n".join(lines) + "\n")
+			sys.stdout.flush()
+			result = None
+		except InterruptException:
+			result = "Calculation interrupted. Unable to analyze prime gaps between {} and {}.".format(start, end)
+		except BrokenPipeError:
+			discard_stdout()
+			result = None
+	
+	if args.firstGap is not None:
+		start = 2 if args.value is None else args.value
+		try:
+			prime = pl.FindPrimeGap(args.firstGap, start, args.end_value, progress, cancel)
+			if prime is None:
+				result = "No gap of {} found between {} and {}.".format(args.firstGap, start, args.end_value if args.end_value is not None else "infinity")
+			else:
+				result = "First gap of {} after {}: {} to {}".format(args.firstGap, start, prime, prime + args.firstGap)
+		except InterruptException:
+			result = "Calculation interrupted. No gap of {} found yet after {}.".format(args.firstGap, start)
+	
+	# Track calculation end time
+	calc_end_time = time.time()
+	calc_time = calc_end_time - calc_start_time
+	pl.RecordTiming("compute", calc_time - (pl.Stats()["timings"].get("load", 0.0) - load_before))
+	
+	# Remove the progress line before the result is printed
+	if progress:
+		progress.Clear()
+	
+	# Display result
+	display_start_time = time.time()
+	if result is not None:
+		print(result)
+	display_end_time = time.time()
+	display_time = display_end_time - display_start_time
+	pl.RecordTiming("format", display_time)
+	
+	# Display timing information if requested
+	if args.showTiming:
+		total_time = time.time() - start_time
+		print("\n--- Timing Information ---")
+		print("Calculation time: {}".format(format_time(calc_time)))
+		print("Display time: {}".format(format_time(display_time)))
+		print("Total runtime: {}".format(format_time(total_time)))
+		stats = pl.ResultCacheStats()
+		if stats["hits"] or stats["misses"]:
+			print("Result cache: {} hits, {} misses".format(stats["hits"], stats["misses"]))
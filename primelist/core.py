@@ -0,0 +1,2499 @@
+"""PrimeList and its stores. NumPy and the process pool modules are imported on first use, and
+nothing is read, written or installed (signal handlers, exit hooks) at import time"""
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, deque
+from itertools import chain, compress, islice
+import mmap
+import os
+from os.path import isfile
+import struct
+import time
+import sys
+import signal
+import threading
+
+# NumPy module once _NumPy has looked for it: None when it is not installed
+_numpy = False
+
+def _NumPy():
+	"""Return numpy, importing it on first use, or None when it is not installed"""
+	global _numpy
+	if _numpy is False:
+		try:
+			import numpy
+			_numpy = numpy
+		except ImportError:
+			_numpy = None
+	return _numpy
+
+class PrimeListInitializationError(Exception):
+	pass
+
+class InterruptException(Exception):
+	"""Exception raised when user interrupts the calculation"""
+	def __init__(self, message="Calculation interrupted by user", partial=None):
+		super().__init__(message)
+		# Result computed before the interruption, when the calculation has a meaningful one
+		self.partial = partial
+
+class CancelToken():
+	"""Cancellation flag for one call: pass it as `cancel`, then Cancel() it from another thread or a
+	signal handler and the call raises InterruptException at its next check"""
+	def __init__(self):
+		self.cancelled = False
+	
+	def Cancel(self):
+		self.cancelled = True
+
+# Number of integers sieved per block; sized to stay within a typical L2 cache
+SEGMENT_SIZE = 1 << 18
+
+# Integers handed to a worker process per task when sieving in parallel
+WORKER_CHUNK = SEGMENT_SIZE * 16
+
+# Largest value that fits in one slot of the compact prime buffer
+UINT64_MAX = (1 << 64) - 1
+
+# Primes below 200 and their product, so one gcd screens out every small factor
+SMALL_PRIMES = tuple(p for p in range(2, 200) if all(p % d for d in range(2, math.isqrt(p) + 1)))
+SMALL_PRIMORIAL = math.prod(SMALL_PRIMES)
+
+# Deterministic Miller-Rabin witness sets: every composite n below the bound fails for
+# at least one witness (Jaeschke; Sinclair's 7-base set for 64-bit; Sorenson-Webster)
+MILLER_RABIN_WITNESSES = (
+	(2047, (2,)),
+	(1373653, (2, 3)),
+	(25326001, (2, 3, 5)),
+	(3215031751, (2, 3, 5, 7)),
+	(2152302898747, (2, 3, 5, 7, 11)),
+	(3474749660383, (2, 3, 5, 7, 11, 13)),
+	(341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+	(1 << 64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+	(318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+	(3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+)
+
+# Numbers checked together by IsPrimeBatch and --batch, and the largest cached prime
+# IsPrimeMany trial-divides by before Miller-Rabin becomes the cheaper test
+BATCH_SIZE = 4096
+TRIAL_BATCH_LIMIT = 1 << 14
+
+# Next/previous prime search: the first window spans twice the start value's bit length (about three
+# average prime gaps) and at least PRIME_SEARCH_WINDOW values. A window is sieved by the primes up to its
+# own width, at most WINDOW_SIEVE_LIMIT; a prime wider than the window costs more to strike out than the
+# tests it saves
+PRIME_SEARCH_WINDOW = 64
+WINDOW_SIEVE_LIMIT = 1 << 16
+
+# Prime pairs (p, p + k) counted by PrimeGapStats, by distance k
+PRIME_PAIRS = ((2, "twins"), (4, "cousins"), (6, "sexy"))
+
+# Slowdown of the pure-Python prime-counting function relative to its NumPy version
+LUCY_PURE_PYTHON_PENALTY = 20
+
+# Factorization: trial division by cached primes up to this bound before Pollard rho
+TRIAL_DIVISION_LIMIT = 1 << 16
+# Brent rho iterations tried before switching to ECM, and values batched per gcd
+RHO_ITERATIONS = 1 << 18
+RHO_BLOCK_SIZE = 128
+# ECM (B1, curves) levels, roughly tuned for 15-, 20-, 25- and 30-digit factors
+ECM_SCHEDULE = ((2000, 25), (11000, 90), (50000, 300), (250000, 700))
+ECM_B2_FACTOR = 100
+ECM_GIANT_STEP = 2310
+
+# Binary primes cache: a fixed header followed by little-endian uint64 records. The header
+# holds the record count and the verified bound: every prime up to it is among the records
+CACHE_FILE = "primes.bin"
+CACHE_MAGIC = b"PRIMES\x00\x02"
+CACHE_HEADER = struct.Struct("<8sQQ")
+# First version of the header, with no verified bound; still read, rewritten on the next save
+CACHE_MAGIC_V1 = b"PRIMES\x00\x01"
+CACHE_HEADER_V1 = struct.Struct("<8sQ")
+RECORD_SIZE = 8
+# Seconds between checkpoints of newly sieved primes during long runs
+CHECKPOINT_INTERVAL = 30.0
+# Side index of primes found by lookups past the verified bound: one covered interval per line,
+# "low high" followed by every prime inside it, appended as lookups add them
+SPORADIC_FILE = "primes_sporadic.txt"
+# Most intervals the side index keeps; past it the least recently added quarter is dropped, and
+# lookups there are worked out again
+SPORADIC_LIMIT = 1 << 16
+# pi(x) checkpoints past the sieved range, one "x count" line each, left by PrimePi and NthPrime
+PI_INDEX_FILE = "primes_pi.txt"
+# Earlier side file holding only primes too large for a 64-bit record, one per line
+LEGACY_OVERFLOW_FILE = "primes_large.txt"
+# Text cache used before the binary format; migrated once when no binary cache exists
+LEGACY_CACHE_FILE = "primes.txt"
+# Wheel-30 bitmap cache (--bitmap): a header (magic, prime count, verified bound) followed by
+# one byte per 30 integers, where bit i of byte k is set when 30k + WHEEL_RESIDUES[i] is prime
+BITMAP_FILE = "primes.wheel"
+BITMAP_MAGIC = b"PRIMEW\x00\x01"
+BITMAP_HEADER = struct.Struct("<8sQQ")
+WHEEL_RESIDUES = (1, 7, 11, 13, 17, 19, 23, 29)
+# Bitmap bytes per rank checkpoint; finding the i-th prime scans at most one block
+WHEEL_RANK_BLOCK = 512
+# Answers to repeated large queries: how many are kept, the smallest argument worth an entry
+# (below it recomputing is as cheap as a lookup), and the file used when they are persisted
+RESULT_CACHE_SIZE = 4096
+RESULT_CACHE_MIN_VALUE = 1 << 32
+RESULT_CACHE_FILE = "results.json"
+
+class PrimeStore():
+	"""Sorted prime storage made of up to three tiers, in ascending order:
+	a read-only base (usually a memory-mapped view of the cache file), an
+	array('Q') tail of primes added since, and an overflow list of values
+	too large for 64 bits."""
+	
+	def __init__(self, values=(), base=None):
+		self._base = base if base is not None else array('Q')
+		self._data = array('Q')
+		self._overflow = []
+		self.extend(values)
+	
+	def __len__(self):
+		return len(self._base) + len(self._data) + len(self._overflow)
+	
+	def __iter__(self):
+		return chain(self._base, self._data, self._overflow)
+	
+	def __contains__(self, val):
+		index = self.bisect_left(val)
+		return index < len(self) and self[index] == val
+	
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, stop, step = index.indices(len(self))
+			fixed = len(self._base) + len(self._data)
+			if step == 1 and stop <= fixed:
+				result = array('Q')
+				result.frombytes(memoryview(self._base[min(start, len(self._base)):min(stop, len(self._base))]).cast('B'))
+				result.extend(self._data[max(start - len(self._base), 0):max(stop - len(self._base), 0)])
+				return result
+			return [self[i] for i in range(start, stop, step)]
+		if index < 0:
+			index += len(self)
+		for tier in (self._base, self._data, self._overflow):
+			if 0 <= index < len(tier):
+				return tier[index]
+			index -= len(tier)
+		raise IndexError("PrimeStore index out of range")
+	
+	def _Bisect(self, bisector, val: int, inclusive: bool):
+		# Tiers are disjoint and ascending, so skip any tier that lies entirely below val
+		tiers = [tier for tier in (self._base, self._data, self._overflow) if tier]
+		offset = 0
+		for i, tier in enumerate(tiers[:-1]):
+			nextFirst = tiers[i + 1][0]
+			if val > nextFirst or (inclusive and val == nextFirst):
+				offset += len(tier)
+			else:
+				return offset + bisector(tier, val)
+		return offset + bisector(tiers[-1], val) if tiers else 0
+	
+	def bisect_left(self, val: int):
+		"""Index of the first stored value >= val"""
+		return self._Bisect(bisect_left, val, False)
+	
+	def bisect_right(self, val: int):
+		"""Index of the first stored value > val"""
+		return self._Bisect(bisect_right, val, True)
+	
+	def NextAbove(self, val: int):
+		"""Smallest stored value > val, or None"""
+		index = self.bisect_right(val)
+		return self[index] if index < len(self) else None
+	
+	def PreviousAtMost(self, val: int):
+		"""Largest stored value <= val, or None"""
+		index = self.bisect_right(val) - 1
+		return self[index] if index >= 0 else None
+	
+	def append(self, val: int):
+		if val <= UINT64_MAX:
+			self._data.append(val)
+		else:
+			self._overflow.append(val)
+	
+	def extend(self, values):
+		if not isinstance(values, (list, array)):
+			values = list(values)
+		if not values:
+			return
+		if isinstance(values, array) or max(values) <= UINT64_MAX:
+			self._data.extend(values)
+		else:
+			for val in values:
+				self.append(val)
+	
+	def ContainsMany(self, values: list):
+		"""Membership test for many values at once, vectorized with NumPy when it is available"""
+		np = _NumPy()
+		if np is None or not values or min(values) < 0 or max(values) > UINT64_MAX:
+			return [val in self for val in values]
+		keys = np.array(values, dtype=np.uint64)
+		found = np.zeros(len(keys), dtype=bool)
+		# Overflow values exceed 64 bits, so only the two uint64 tiers can hold a key
+		for tier in (self._base, self._data):
+			if len(tier):
+				stored = np.frombuffer(tier, dtype=np.uint64)
+				index = np.minimum(np.searchsorted(stored, keys), len(stored) - 1)
+				found |= stored[index] == keys
+		return found.tolist()
+	
+	def Materialize(self):
+		"""Copy the read-only base into the writable tail so it can be modified"""
+		if self._base:
+			data = array('Q')
+			data.frombytes(memoryview(self._base).cast('B'))
+			data.extend(self._data)
+			self._data = data
+		self._base = array('Q')
+	
+	def Rebase(self, base):
+		"""Replace the base and tail with a new base holding the same values"""
+		self._base, self._data = base, array('Q')
+
+# Bit of each residue mod 30 in a wheel byte (0 for residues sharing a factor with 30), the bits
+# of the residues below r, the residues set in each byte value, and the bit count of each byte value
+_WHEEL_BIT = [1 << WHEEL_RESIDUES.index(r) if r in WHEEL_RESIDUES else 0 for r in range(30)]
+_WHEEL_BELOW = [sum(bit for bit in _WHEEL_BIT[:r]) for r in range(31)]
+_BYTE_RESIDUES = [tuple(r for i, r in enumerate(WHEEL_RESIDUES) if b >> i & 1) for b in range(256)]
+_POPCOUNT = bytes(bin(b).count('1') for b in range(256))
+
+def _Popcount(data):
+	value = int.from_bytes(data, 'little')
+	# int.bit_count is Python 3.10+
+	return value.bit_count() if hasattr(value, 'bit_count') else bin(value).count('1')
+
+class WheelStore():
+	"""Sorted prime storage as a wheel-30 bitmap: one bit for each integer coprime to 30, about
+	one byte per 30 integers. It offers the PrimeStore interface PrimeList relies on; values can
+	only be added above the largest stored one. Like PrimeStore, the bytes are a read-only base
+	(usually a memory-mapped view of the bitmap file) followed by a writable bytearray tail.
+	base, data, bound and count restore a saved bitmap."""
+	
+	def __init__(self, values=(), base=None, data=None, bound: int = 0, count: int = 0):
+		self._base = base if base is not None else b""
+		self._data = data if data is not None else bytearray()
+		# 2, 3 and 5 have no wheel bit
+		self._small = [p for p in (2, 3, 5) if p <= bound]
+		self._count = count
+		# _ranks[b] is the number of wheel bits in the bytes before block b, built on demand
+		self._ranks = array('Q', [0])
+		self.extend(values)
+	
+	def __len__(self):
+		return self._count
+	
+	def __iter__(self):
+		yield from self._small
+		step = SEGMENT_SIZE // 30
+		size = self._Size()
+		for k in range(0, size, step):
+			yield from self._Decode(k, min(k + step, size))
+	
+	def __contains__(self, val):
+		if val < 7:
+			return val in self._small
+		k = val // 30
+		return k < self._Size() and bool(self._Byte(k) & _WHEEL_BIT[val % 30])
+	
+	def _Size(self):
+		"""Number of bitmap bytes"""
+		return len(self._base) + len(self._data)
+	
+	def _Byte(self, k: int):
+		if k < len(self._base):
+			return self._base[k]
+		return self._data[k - len(self._base)]
+	
+	def _Bytes(self, k0: int, k1: int):
+		"""Bitmap bytes [k0, k1) as a bytes-like object, copied only when they span both tiers"""
+		split = len(self._base)
+		if k1 <= split:
+			return self._base[k0:k1]
+		if k0 >= split:
+			return self._data[k0 - split:k1 - split]
+		return bytes(self._base[k0:]) + self._data[:k1 - split]
+	
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, stop, step = index.indices(self._count)
+			if step != 1:
+				return [self[i] for i in range(start, stop, step)]
+			return self._Slice(start, stop)
+		if index < 0:
+			index += self._count
+		if not 0 <= index < self._count:
+			raise IndexError("WheelStore index out of range")
+		if index < len(self._small):
+			return self._small[index]
+		if index == self._count - 1:
+			# The largest prime is in the last nonzero byte, found without the rank index
+			k = self._Size() - 1
+			while not self._Byte(k):
+				k -= 1
+			return 30 * k + _BYTE_RESIDUES[self._Byte(k)][-1]
+		index -= len(self._small)
+		k, seen = self._Locate(index)
+		return 30 * k + _BYTE_RESIDUES[self._Byte(k)][index - seen]
+	
+	def _Ranks(self, block: int):
+		"""Extend the rank checkpoints through the given block"""
+		while len(self._ranks) <= block:
+			b = len(self._ranks) - 1
+			self._ranks.append(self._ranks[b] + _Popcount(self._Bytes(b * WHEEL_RANK_BLOCK, (b + 1) * WHEEL_RANK_BLOCK)))
+	
+	def _RankBytes(self, k: int):
+		"""Number of wheel primes in bytes [0, k), by popcount from the nearest checkpoint"""
+		block = k // WHEEL_RANK_BLOCK
+		self._Ranks(block)
+		return self._ranks[block] + _Popcount(self._Bytes(block * WHEEL_RANK_BLOCK, k))
+	
+	def _Locate(self, index: int):
+		"""Byte holding the wheel prime of the given rank, and the number of wheel primes before it"""
+		self._Ranks(self._Size() // WHEEL_RANK_BLOCK)
+		block = bisect_right(self._ranks, index) - 1
+		k, seen = block * WHEEL_RANK_BLOCK, self._ranks[block]
+		for b in self._Bytes(k, k + WHEEL_RANK_BLOCK):
+			if seen + _POPCOUNT[b] > index:
+				break
+			seen += _POPCOUNT[b]
+			k += 1
+		return k, seen
+	
+	def _Decode(self, k0: int, k1: int):
+		"""The wheel primes in bytes [k0, k1) as an array('Q')"""
+		result = array('Q')
+		if k1 <= k0:
+			return result
+		np = _NumPy()
+		if np is not None:
+			bits = np.unpackbits(np.frombuffer(self._Bytes(k0, k1), dtype=np.uint8), bitorder='little')
+			index = np.flatnonzero(bits)
+			values = ((index >> 3) + k0).astype(np.uint64) * 30 + np.array(WHEEL_RESIDUES, dtype=np.uint64)[index & 7]
+			result.frombytes(values.tobytes())
+			return result
+		result.extend(30 * k + r for k, b in enumerate(self._Bytes(k0, k1), k0) for r in _BYTE_RESIDUES[b])
+		return result
+	
+	def _Slice(self, start: int, stop: int):
+		result = array('Q', self._small[start:stop])
+		first, last = max(start - len(self._small), 0), stop - len(self._small)
+		if last > first:
+			k0, seen = self._Locate(first)
+			k1, _ = self._Locate(last - 1)
+			result.extend(self._Decode(k0, k1 + 1)[first - seen:last - seen])
+		return result
+	
+	def bisect_left(self, val: int):
+		"""Index of the first stored value >= val"""
+		if val <= 7:
+			return bisect_left(self._small, val)
+		k, r = divmod(val, 30)
+		if k >= self._Size():
+			return self._count
+		return len(self._small) + self._RankBytes(k) + _POPCOUNT[self._Byte(k) & _WHEEL_BELOW[r]]
+	
+	def bisect_right(self, val: int):
+		"""Index of the first stored value > val"""
+		return self.bisect_left(val + 1)
+	
+	def NextAbove(self, val: int):
+		"""Smallest stored value > val, or None, by scanning forward for the next set bit"""
+		for p in self._small:
+			if p > val:
+				return p
+		k, r = divmod(max(val + 1, 7), 30)
+		size = self._Size()
+		bits = self._Byte(k) & ~_WHEEL_BELOW[r] if k < size else 0
+		while not bits:
+			k += 1
+			if k >= size:
+				return None
+			bits = self._Byte(k)
+		return 30 * k + _BYTE_RESIDUES[bits][0]
+	
+	def PreviousAtMost(self, val: int):
+		"""Largest stored value <= val, or None, by scanning backward for the previous set bit"""
+		k, r = divmod(max(val, 0), 30)
+		size = self._Size()
+		if k >= size:
+			k, bits = size - 1, self._Byte(size - 1) if size else 0
+		else:
+			bits = self._Byte(k) & _WHEEL_BELOW[r + 1]
+		while not bits and k > 0:
+			k -= 1
+			bits = self._Byte(k)
+		if bits:
+			return 30 * k + _BYTE_RESIDUES[bits][-1]
+		small = [p for p in self._small if p <= val]
+		return small[-1] if small else None
+	
+	def append(self, val: int):
+		self.extend([val])
+	
+	def extend(self, values):
+		"""Add ascending primes, all above the largest stored one"""
+		values = values if isinstance(values, (list, array, memoryview)) else list(values)
+		# Peel off 2, 3 and 5, which have no wheel bit
+		skip = 0
+		while skip < len(values) and values[skip] < 7:
+			self._small.append(values[skip])
+			skip += 1
+		self._count += skip
+		if skip == len(values):
+			return
+		k0, k1 = values[skip] // 30, values[-1] // 30
+		if k0 < len(self._base):
+			self.Materialize()
+		split = len(self._base)
+		if k1 >= self._Size():
+			self._data.extend(bytes(k1 + 1 - self._Size()))
+		# Checkpoints past the first changed byte are stale
+		del self._ranks[k0 // WHEEL_RANK_BLOCK + 1:]
+		np = _NumPy()
+		if np is not None and len(values) - skip > 64:
+			keys = np.asarray(values[skip:], dtype=np.uint64)
+			bits = np.array(_WHEEL_BIT, dtype=np.uint8)[keys % 30]
+			# Values are distinct, so summing the bits of each byte is the same as or-ing them
+			merged = np.bincount((keys // 30 - k0).astype(np.intp), weights=bits, minlength=k1 - k0 + 1).astype(np.uint8)
+			window = np.frombuffer(self._data, dtype=np.uint8, count=k1 - k0 + 1, offset=k0 - split)
+			window |= merged
+			del window
+		else:
+			for val in values[skip:]:
+				self._data[val // 30 - split] |= _WHEEL_BIT[val % 30]
+		self._count += len(values) - skip
+	
+	def ContainsMany(self, values: list):
+		"""Membership test for many values at once; each is a single bit lookup"""
+		return [val in self for val in values]
+	
+	def Materialize(self):
+		"""Copy the read-only base into the writable tail so it can be modified"""
+		if self._base:
+			self._data = bytearray(self._base) + self._data
+		self._base = b""
+	
+	def Rebase(self, base, data):
+		"""Replace the base and tail with new ones holding the same bytes"""
+		self._base, self._data = base, data
+
+class ResultCache():
+	"""Bounded least-recently-used map from (operation, argument) to a computed answer,
+	optionally kept in a JSON file between runs. A size of 0 disables it."""
+	
+	def __init__(self, maxSize: int = RESULT_CACHE_SIZE, path=None):
+		self.maxSize = maxSize
+		self.path = path
+		self.hits = 0
+		self.misses = 0
+		# Read from path on first use
+		self._entries = None
+		self._dirty = False
+		# --serve answers requests on several threads; reentrant because loading goes through Put
+		self._lock = threading.RLock()
+	
+	def _Load(self):
+		import json
+		self._entries = OrderedDict()
+		if self.path and isfile(self.path):
+			try:
+				with open(self.path, 'r') as f:
+					for op, arg, value in json.load(f):
+						self.Put(op, arg, value)
+			except (ValueError, TypeError):
+				# A damaged file only costs recomputation; it is rewritten on the next save
+				self._entries.clear()
+			self._dirty = False
+	
+	def Get(self, op: str, arg: int):
+		"""The stored answer, or None on a miss"""
+		if self.maxSize <= 0:
+			return None
+		with self._lock:
+			if self._entries is None:
+				self._Load()
+			key = (op, arg)
+			value = self._entries.get(key)
+			if value is None:
+				self.misses += 1
+				return None
+			self._entries.move_to_end(key)
+			self.hits += 1
+		# Lists are kept as tuples so callers cannot change the stored answer
+		return list(value) if isinstance(value, tuple) else value
+	
+	def Put(self, op: str, arg: int, value):
+		if self.maxSize <= 0 or value is None:
+			return
+		with self._lock:
+			if self._entries is None:
+				self._Load()
+			key = (op, arg)
+			self._entries[key] = tuple(value) if isinstance(value, list) else value
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.maxSize:
+				self._entries.popitem(last=False)
+			self._dirty = True
+	
+	def Save(self):
+		"""Write the entries to path, least recently used first, if any changed"""
+		import json
+		if not self.path or not self._dirty:
+			return
+		tmpFile = self.path + ".tmp"
+		with self._lock:
+			with open(tmpFile, 'w') as f:
+				json.dump([[op, arg, list(value) if isinstance(value, tuple) else value]
+					for (op, arg), value in self._entries.items()], f)
+			os.replace(tmpFile, self.path)
+			self._dirty = False
+	
+	def Stats(self):
+		return {"size": len(self._entries or ()), "maxSize": self.maxSize, "hits": self.hits, "misses": self.misses}
+
+# Per-process state of parallel sieve workers, set up by _InitWorker
+_workerPrimeList = None
+_workerBasePrimes = None
+_workerCancel = None
+
+def _InitWorker(basePrimes, cancelEvent):
+	"""Process pool initializer: leave Ctrl+C to the parent, which cancels through cancelEvent"""
+	global _workerPrimeList, _workerBasePrimes, _workerCancel
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+	_workerPrimeList = PrimeList()
+	_workerBasePrimes = basePrimes
+	_workerCancel = cancelEvent
+
+def _SievePrimesWorker(low: int, high: int):
+	"""Return the primes in [low, high) as an array('Q'), or None if the run was cancelled"""
+	primes = array('Q')
+	for segLow in range(low, high, SEGMENT_SIZE):
+		if _workerCancel.is_set():
+			return None
+		primes.extend(_workerPrimeList.SieveSegment(segLow, min(segLow + SEGMENT_SIZE, high), _workerBasePrimes))
+	return primes
+
+def _CountPrimesWorker(low: int, high: int):
+	"""Return the number of primes in [low, high), or None if the run was cancelled"""
+	count = 0
+	for segLow in range(low, high, SEGMENT_SIZE):
+		if _workerCancel.is_set():
+			return None
+		count += _workerPrimeList.SieveSegmentFlags(segLow, min(segLow + SEGMENT_SIZE, high), _workerBasePrimes).count(1)
+	return count
+
+class _EventCancelToken():
+	"""CancelToken view of the multiprocessing.Event that pool workers are cancelled through"""
+	def __init__(self, event):
+		self._event = event
+	
+	@property
+	def cancelled(self):
+		return self._event.is_set()
+
+def _FactorWorker(n: int):
+	"""Return the prime factors of n, which has no prime factor up to the trial division limit,
+	or None if the run was cancelled"""
+	try:
+		return _workerPrimeList._FactorRemainder(n, _EventCancelToken(_workerCancel))
+	except InterruptException:
+		return None
+
+class FactorPool():
+	"""Worker processes that GetPrimeFactorsBatch hands hard cofactors to, kept across calls so a
+	stream of batches starts them once. Close() (or leaving a with block) stops any factorization
+	still running and shuts the workers down."""
+	
+	def __init__(self, workers: int):
+		from concurrent.futures import ProcessPoolExecutor
+		import multiprocessing
+		self._stop = multiprocessing.Event()
+		self.executor = ProcessPoolExecutor(workers, initializer=_InitWorker, initargs=([], self._stop))
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, *exc):
+		self.Close()
+	
+	def Close(self):
+		# Workers check the event, so factorizations still queued return at once as well
+		self._stop.set()
+		self.executor.shutdown(wait=True)
+
+def _ProductTree(values: list):
+	"""Levels of a product tree, leaves (values) first and the product of all of them last"""
+	levels = [values]
+	while len(levels[-1]) > 1:
+		level = levels[-1]
+		levels.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)])
+	return levels
+
+def _RemainderTree(x: int, levels: list):
+	"""x modulo each leaf of a product tree, reducing by each level on the way down"""
+	remainders = [x % levels[-1][0]]
+	for level in reversed(levels[:-1]):
+		remainders = [remainders[i // 2] % value for i, value in enumerate(level)]
+	return remainders
+
+class PrimeList():
+	_listIter = 0
+	
+	def __init__(self, resultCacheSize: int = RESULT_CACHE_SIZE, persistResults: bool = False, bitmap: bool = False, checkpoints: bool = False, counters: bool = False):
+		# Nothing is read until a method first needs the stored primes
+		self._store = None
+		# With bitmap set the store is a WheelStore saved to BITMAP_FILE instead of CACHE_FILE
+		self._bitmap = bitmap
+		# Bitmap bytes already in BITMAP_FILE, None while it has not been written
+		self._persistedBytes = None
+		self._mmap = None
+		# Number of records in the cache file that the store's base still mirrors
+		self._persistedCount = 0
+		# Header size of the cache file on disk, None while there is no file
+		self._headerSize = None
+		# Every prime up to the verified bound is stored; the persisted one is what the file says
+		self._verifiedBound = 0
+		self._persistedBound = 0
+		# With checkpoints set, long sieve runs save every CHECKPOINT_INTERVAL seconds
+		self._checkpoints = checkpoints
+		self._lastCheckpoint = time.time()
+		# Side index: disjoint sorted intervals [low, high] past the verified bound whose primes
+		# are all in _sporadic. Lookups record what they prove here instead of in the store;
+		# _coveredAges says when each interval was last added to
+		self._coveredLows = []
+		self._coveredHighs = []
+		self._coveredAges = []
+		self._sporadic = []
+		self._nextAge = 0
+		# SPORADIC_FILE is a log of additions: _sporadicLines are in it, _sporadicNew are not yet.
+		# It is rewritten from the live intervals when stale lines outnumber them or some were dropped
+		self._sporadicLines = 0
+		self._sporadicNew = []
+		self._sporadicRewrite = False
+		# Sorted checkpoints x -> pi(x) past the verified bound; between them and the cache, pi(x)
+		# and the n-th prime are a bisection plus a short sieve away
+		self._piBounds = []
+		self._piCounts = []
+		self._piDirty = False
+		# Answers to large queries, kept in RESULT_CACHE_FILE between runs when persistResults is set
+		self._results = ResultCache(resultCacheSize, RESULT_CACHE_FILE if persistResults else None)
+		# Event counts and seconds spent per phase, reported by Stats(); events are only counted with
+		# counters set, so the hot paths pay a single flag check otherwise
+		self._counting = counters
+		self._counters = Counter()
+		self._timings = Counter()
+		# ECM stage tables, built once per bound
+		self._ecmPlans = {}
+		# Small primes for sieving next/previous prime search windows, built on first use
+		self._windowPrimes = None
+		# Product tree of the primes up to TRIAL_DIVISION_LIMIT for batch factorization, built on first use
+		self._trialTree = None
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, *exc):
+		# Nothing is saved implicitly unless checkpoints are on: leaving a with block (or calling Save)
+		# persists new primes
+		self.Save()
+	
+	@property
+	def _list(self):
+		"""The prime store, loaded from the cache on first use"""
+		if self._store is None:
+			started = time.perf_counter()
+			try:
+				self._store = self._LoadCache()
+				self._AbsorbCovered()
+			except Exception as err:
+				raise PrimeListInitializationError(err)
+			self._timings["load"] += time.perf_counter() - started
+		return self._store
+	
+	def _LoadCache(self):
+		"""Read the cached primes; only the contiguous sieved prefix goes into the store"""
+		strays = []
+		if self._bitmap and isfile(BITMAP_FILE):
+			store = self._ReadBitmap()
+		else:
+			if isfile(CACHE_FILE):
+				records = self._MapCache()
+			else:
+				records = array('Q')
+				if isfile(LEGACY_CACHE_FILE):
+					# One-time migration: parse the old text cache, the next Save() writes it as binary
+					with open(LEGACY_CACHE_FILE, 'r') as f:
+						for line in f:
+							if line.strip():
+								val = int(line)
+								if val <= UINT64_MAX:
+									records.append(val)
+								else:
+									strays.append(val)
+				self._persistedBound = None
+			
+			# Records past the verified bound were appended by lookups, not by the sieve
+			sieved = ()
+			if self._persistedBound is not None:
+				count = bisect_right(records, self._persistedBound)
+				self._verifiedBound = self._persistedBound
+			elif self._headerSize == CACHE_HEADER.size:
+				# A current cache cut short by a crash: what is left was all written by the sieve
+				count = len(records)
+				self._verifiedBound = records[-1] if count else 0
+			else:
+				# Older caches say nothing about where sieved primes stop, so sieve them again
+				count, sieved, self._verifiedBound = self._ResieveLegacy(records)
+			if count < len(records):
+				# Records the new sieve passed over are superseded by it
+				strays[:0] = [val for val in records[count:] if val > self._verifiedBound]
+				records = records[:count]
+			if self._bitmap:
+				# One-time conversion: the next Save() writes the bitmap, CACHE_FILE is left as it was
+				store = WheelStore(records)
+				store.extend(sieved)
+				del records
+				self._CloseMap(self._mmap)
+				self._mmap = None
+			else:
+				store = PrimeStore(base=records)
+				store.extend(sieved)
+		
+		if isfile(SPORADIC_FILE):
+			entries = []
+			with open(SPORADIC_FILE, 'r') as f:
+				for line in f:
+					if not line.endswith("\n"):
+						# Cut short by a crash during an append; dropped, and left out when the file is rewritten
+						self._sporadicRewrite = True
+						break
+					fields = [int(x) for x in line.split()]
+					if len(fields) >= 2:
+						entries.append((fields[0], fields[1], fields[2:]))
+					self._sporadicLines += 1
+			self._LoadCovered(entries)
+			while len(self._coveredLows) > SPORADIC_LIMIT:
+				self._DropOldestCovered()
+		if isfile(PI_INDEX_FILE):
+			with open(PI_INDEX_FILE, 'r') as f:
+				for line in f:
+					fields = [int(x) for x in line.split()]
+					if len(fields) == 2:
+						self._AddPiCheckpoint(*fields)
+			self._piDirty = False
+		if isfile(LEGACY_OVERFLOW_FILE):
+			with open(LEGACY_OVERFLOW_FILE, 'r') as f:
+				strays.extend(int(line) for line in f if line.strip())
+		for val in strays:
+			self._AddCovered(val, val, [val])
+		return store
+	
+	def _ResieveLegacy(self, records):
+		"""Check records from a cache written without a verified bound against a fresh sieve, which runs
+		segment by segment from 2 until a segment holds no record. Returns how many leading records are
+		exactly the primes up to the last of them, the sieved primes after those, and the last record
+		the sieve reached: every prime up to it is in one or the other"""
+		count = index = 0
+		matching = True
+		sieved = array('Q')
+		low = 2
+		baseLimit, basePrimes = 1, []
+		while index < len(records) and records[index] < low + SEGMENT_SIZE:
+			high = low + SEGMENT_SIZE
+			while baseLimit * baseLimit < high:
+				baseLimit *= 2
+				basePrimes = self.SieveBasePrimes(baseLimit)
+			primes = self.SieveSegment(low, high, basePrimes)
+			# Records of this segment; an out-of-order one is consumed too, so the walk moves on
+			stop = max(bisect_left(records, high, index), index + 1)
+			if matching:
+				held = records[index:stop].tolist()
+				same = 0
+				while same < min(len(held), len(primes)) and held[same] == primes[same]:
+					same += 1
+				count = index + same
+				# A stray or a missing prime ends the prefix; the sieve's primes stand in for the rest
+				matching = held == primes
+				sieved.extend(primes[same:])
+			else:
+				sieved.extend(primes)
+			index = stop
+			low = high
+		if not index:
+			return 0, sieved, 0
+		# The sieve ends at the last record it reached
+		bound = min(records[index - 1], low - 1)
+		del sieved[bisect_right(sieved, bound):]
+		return count, sieved, bound
+	
+	def _MapCache(self):
+		"""Memory-map the binary cache and return its records as a read-only uint64 view"""
+		with open(CACHE_FILE, 'rb') as f:
+			fileSize = os.fstat(f.fileno()).st_size
+			magic = f.read(len(CACHE_MAGIC))
+			if magic == CACHE_MAGIC:
+				header = CACHE_HEADER
+			elif magic == CACHE_MAGIC_V1:
+				header = CACHE_HEADER_V1
+			else:
+				raise ValueError("{} is not a primes cache".format(CACHE_FILE))
+			f.seek(0)
+			fields = f.read(header.size)
+			if len(fields) < header.size:
+				raise ValueError("{} is truncated".format(CACHE_FILE))
+			fields = header.unpack(fields)
+			# Records past the header count are from an append that never committed; a count
+			# past the end of the file means the file itself was cut short
+			count = min(fields[1], (fileSize - header.size) // RECORD_SIZE)
+			self._headerSize = header.size
+			self._persistedCount = count
+			if count == 0:
+				self._persistedBound = fields[2] if header is CACHE_HEADER else None
+				return array('Q')
+			mm = mmap.mmap(f.fileno(), header.size + count * RECORD_SIZE, access=mmap.ACCESS_READ)
+		view = memoryview(mm)[header.size:].cast('Q')
+		if sys.byteorder != 'little':
+			# Records are little-endian on disk, so big-endian hosts need a swapped copy
+			records = array('Q')
+			records.frombytes(view.cast('B'))
+			records.byteswap()
+			view = records
+		else:
+			self._mmap = mm
+		# None when no trustworthy bound is recorded
+		self._persistedBound = fields[2] if header is CACHE_HEADER and count == fields[1] else None
+		return view
+	
+	def _ReadBitmap(self):
+		"""Memory-map the wheel bitmap cache as a WheelStore. Every byte before the bound's one is a
+		read-only view of the file; that last byte, which new primes may still add bits to, is copied"""
+		with open(BITMAP_FILE, 'rb') as f:
+			fileSize = os.fstat(f.fileno()).st_size
+			fields = f.read(BITMAP_HEADER.size)
+			if len(fields) < BITMAP_HEADER.size:
+				raise ValueError("{} is truncated".format(BITMAP_FILE))
+			magic, count, bound = BITMAP_HEADER.unpack(fields)
+			if magic != BITMAP_MAGIC:
+				raise ValueError("{} is not a primes bitmap".format(BITMAP_FILE))
+			size = bound // 30 + 1 if bound else 0
+			if fileSize < BITMAP_HEADER.size + size:
+				raise ValueError("{} is truncated".format(BITMAP_FILE))
+			base, data = b"", bytearray()
+			if size > 1:
+				mm = mmap.mmap(f.fileno(), BITMAP_HEADER.size + size - 1, access=mmap.ACCESS_READ)
+				base = memoryview(mm)[BITMAP_HEADER.size:]
+				self._mmap = mm
+			if size:
+				f.seek(BITMAP_HEADER.size + size - 1)
+				data = bytearray(f.read(1))
+				# Bits past the bound come from an append that never committed
+				data[-1] &= _WHEEL_BELOW[bound % 30 + 1]
+		self._persistedBytes = size
+		self._persistedBound = bound
+		self._verifiedBound = bound
+		return WheelStore(base=base, data=data, bound=bound, count=count)
+	
+	def _SaveBitmap(self, store):
+		"""Write the bitmap cache, rewriting only the bytes from the last persisted one on, then map it again"""
+		if self._persistedBytes is not None and self._verifiedBound == self._persistedBound:
+			return
+		# The file always reaches the byte of the bound, so a shorter one is known to be cut off
+		size = self._verifiedBound // 30 + 1 if self._verifiedBound else 0
+		if store._Size() < size:
+			store._data.extend(bytes(size - store._Size()))
+		header = BITMAP_HEADER.pack(BITMAP_MAGIC, len(store), self._verifiedBound)
+		if self._persistedBytes is None:
+			tmpFile = BITMAP_FILE + ".tmp"
+			with open(tmpFile, 'wb') as f:
+				f.write(header)
+				f.write(store._base)
+				f.write(store._data)
+				f.flush()
+				os.fsync(f.fileno())
+			if os.name == 'nt':
+				# Windows cannot replace a file that is still mapped
+				store.Materialize()
+				self._CloseMap(self._mmap)
+				self._mmap = None
+			os.replace(tmpFile, BITMAP_FILE)
+			self._SyncDirectory()
+		else:
+			# The bitmap only grows at the end; the last persisted byte may have gained bits.
+			# As with CACHE_FILE, the new bytes are durable before the header commits them
+			offset = max(self._persistedBytes - 1, 0)
+			with open(BITMAP_FILE, 'r+b') as f:
+				f.seek(BITMAP_HEADER.size + offset)
+				f.write(store._Bytes(offset, store._Size()))
+				f.truncate()
+				f.flush()
+				os.fsync(f.fileno())
+				f.seek(0)
+				f.write(header)
+				f.flush()
+				os.fsync(f.fileno())
+		
+		# Swap the written tail for a view of the file, as Save does for CACHE_FILE
+		oldMap = self._mmap
+		self._mmap = None
+		mapped = self._ReadBitmap()
+		store.Rebase(mapped._base, mapped._data)
+		self._CloseMap(oldMap)
+	
+	def _RecordBytes(self, values):
+		if sys.byteorder != 'little':
+			values = array('Q', values)
+			values.byteswap()
+		return memoryview(values).cast('B')
+	
+	def Save(self):
+		"""Persist primes added since the cache was loaded, appending when only the tail is new"""
+		started = time.perf_counter()
+		self._Persist()
+		self._timings["persist"] += time.perf_counter() - started
+	
+	def _Persist(self):
+		self._results.Save()
+		if self._store is None:
+			# Never loaded, so nothing can have changed
+			return
+		store = self._store
+		if self._sporadicRewrite or self._sporadicLines + len(self._sporadicNew) > 2 * len(self._coveredLows):
+			# Mostly intervals since merged, absorbed or dropped: write the live ones, oldest first
+			tmpFile = SPORADIC_FILE + ".tmp"
+			with open(tmpFile, 'w') as f:
+				for i in sorted(range(len(self._coveredAges)), key=self._coveredAges.__getitem__):
+					low, high = self._coveredLows[i], self._coveredHighs[i]
+					first, last = bisect_left(self._sporadic, low), bisect_right(self._sporadic, high)
+					f.write(" ".join(map(str, [low, high] + self._sporadic[first:last])) + "\n")
+			os.replace(tmpFile, SPORADIC_FILE)
+			self._sporadicLines = len(self._coveredLows)
+			self._sporadicNew = []
+			self._sporadicRewrite = False
+		elif self._sporadicNew:
+			# Only additions since the last save: append them, as replaying the file merges them anyway
+			with open(SPORADIC_FILE, 'a') as f:
+				for low, high, primes in self._sporadicNew:
+					f.write(" ".join(map(str, [low, high] + primes)) + "\n")
+			self._sporadicLines += len(self._sporadicNew)
+			self._sporadicNew = []
+		if isfile(LEGACY_OVERFLOW_FILE):
+			# Its primes joined the side index on load, so SPORADIC_FILE now holds them
+			os.remove(LEGACY_OVERFLOW_FILE)
+		if self._piDirty:
+			tmpFile = PI_INDEX_FILE + ".tmp"
+			with open(tmpFile, 'w') as f:
+				for x, count in zip(self._piBounds, self._piCounts):
+					# Checkpoints the sieve has since passed are answered by the cache
+					if x > self._verifiedBound:
+						f.write("{} {}\n".format(x, count))
+			os.replace(tmpFile, PI_INDEX_FILE)
+			self._piDirty = False
+		
+		if self._bitmap:
+			self._SaveBitmap(store)
+			return
+		count = len(store._base) + len(store._data)
+		header = CACHE_HEADER.pack(CACHE_MAGIC, count, self._verifiedBound)
+		if len(store._base) == self._persistedCount and self._headerSize in (None, CACHE_HEADER.size):
+			if not store._data and self._verifiedBound == self._persistedBound:
+				return
+			if self._headerSize is None:
+				# Commit an empty cache first so a crash never leaves a file without a header
+				with open(CACHE_FILE, 'wb') as f:
+					f.write(CACHE_HEADER.pack(CACHE_MAGIC, 0, 0))
+					f.flush()
+					os.fsync(f.fileno())
+			# Only new primes past the stored ones: append them, make them durable, then commit
+			# them by rewriting the header. A crash before the header write loses only this append
+			with open(CACHE_FILE, 'r+b') as f:
+				f.seek(CACHE_HEADER.size + self._persistedCount * RECORD_SIZE)
+				f.write(self._RecordBytes(store._data))
+				f.truncate()
+				f.flush()
+				os.fsync(f.fileno())
+				f.seek(0)
+				f.write(header)
+				f.flush()
+				os.fsync(f.fileno())
+		else:
+			# Stored records changed, so write a complete new file and swap it in
+			tmpFile = CACHE_FILE + ".tmp"
+			with open(tmpFile, 'wb') as f:
+				f.write(header)
+				f.write(self._RecordBytes(store._base))
+				f.write(self._RecordBytes(store._data))
+				f.flush()
+				os.fsync(f.fileno())
+			if os.name == 'nt':
+				# Windows cannot replace a file that is still mapped
+				store.Materialize()
+				self._CloseMap(self._mmap)
+				self._mmap = None
+			os.replace(tmpFile, CACHE_FILE)
+			self._SyncDirectory()
+		
+		oldMap = self._mmap
+		self._mmap = None
+		store.Rebase(self._MapCache())
+		self._CloseMap(oldMap)
+	
+	def _SyncDirectory(self):
+		# Make a rename durable; directories cannot be opened this way on Windows
+		if os.name != 'nt':
+			fd = os.open(os.path.dirname(os.path.abspath(CACHE_FILE)), os.O_RDONLY)
+			try:
+				os.fsync(fd)
+			finally:
+				os.close(fd)
+	
+	def Checkpoint(self):
+		"""Save if checkpoints are on and CHECKPOINT_INTERVAL seconds have passed since the last one"""
+		if self._checkpoints and time.time() - self._lastCheckpoint >= CHECKPOINT_INTERVAL:
+			self.Save()
+			self._lastCheckpoint = time.time()
+	
+	def _CloseMap(self, mm):
+		if mm is None:
+			return
+		try:
+			mm.close()
+		except BufferError:
+			# A view into the old mapping is still alive; it is unmapped once released
+			pass
+	
+	def __iter__(self):
+		self._listIter = 0
+		return self
+	
+	def __next__(self):
+		if self._listIter >= len(self._list):
+			raise StopIteration
+		val = self._list[self._listIter]
+		self._listIter += 1
+		return val
+	
+	def __len__(self):
+		return len(self._list)
+	
+	def __contains__(self, val):
+		return self.IsInPrimeList(val)
+	
+	def __getitem__(self, index):
+		return self._list[index]
+	
+	def __repr__(self):
+		return "PrimeList()"
+	
+	def __str__(self):
+		# Write one prime per line, ending with a newline
+		return "\n".join(map(str, self._list)) + "\n"
+	
+	def ConvertIntToDigitList(self, num: int):
+		return [int(x) for x in str(num)]
+	
+	def ConvertListToInt(self, numList: list):
+		return int("".join([str(x) for x in numList]))
+	
+	def SumIntDigits(self, num: int):
+		return sum(int(i) for i in str(num))
+	
+	def GetMax(self):
+		"""Largest prime in the sieved range of the list"""
+		if not self._list:
+			return 0
+		return self._list[-1]
+	
+	def RecordTiming(self, phase: str, seconds: float):
+		"""Add seconds to a phase of the run; load and persist are recorded by the list itself"""
+		self._timings[phase] += seconds
+	
+	def Stats(self):
+		"""Event counters (empty unless the list was made with counters set), seconds per phase and
+		result cache figures, as plain dicts"""
+		return {"timings": dict(self._timings), "counters": dict(self._counters), "resultCache": self._results.Stats()}
+	
+	def ResultCacheStats(self):
+		"""Size, capacity, hits and misses of the large-query result cache"""
+		return self._results.Stats()
+	
+	def GetVerifiedBound(self):
+		"""Largest value up to which every prime is known to be in the list"""
+		# Touching the store loads the cache, which sets the bound
+		self._list
+		return self._verifiedBound
+	
+	def StoredBound(self, bitmap: bool = None):
+		"""Verified bound recorded in a cache file's header, read without loading the cache: the bitmap
+		when bitmap is set, CACHE_FILE when it is not, this list's own format by default. 0 when the
+		file is missing or unreadable; for a first-version CACHE_FILE, its last record"""
+		if bitmap is None:
+			bitmap = self._bitmap
+		path, header = (BITMAP_FILE, BITMAP_HEADER) if bitmap else (CACHE_FILE, CACHE_HEADER)
+		if not isfile(path):
+			return 0
+		with open(path, 'rb') as f:
+			fields = f.read(header.size)
+			if bitmap:
+				return header.unpack(fields)[2] if len(fields) == header.size and fields.startswith(BITMAP_MAGIC) else 0
+			if len(fields) == header.size and fields.startswith(CACHE_MAGIC):
+				return header.unpack(fields)[2]
+			if len(fields) >= CACHE_HEADER_V1.size and fields.startswith(CACHE_MAGIC_V1):
+				count = CACHE_HEADER_V1.unpack(fields[:CACHE_HEADER_V1.size])[1]
+				f.seek(CACHE_HEADER_V1.size + (count - 1) * RECORD_SIZE)
+				record = f.read(RECORD_SIZE)
+				return struct.unpack("<Q", record)[0] if count and len(record) == RECORD_SIZE else 0
+		return 0
+	
+	def PrimesUpTo(self, bound: int):
+		"""Return the stored primes <= bound, touching only that prefix of the cache"""
+		return self._list[:self._list.bisect_right(bound)]
+	
+	def AppendValue(self, val: int):
+		"""Record a prime found outside the sieve; the sieved range already holds every prime in it"""
+		if val > self.GetVerifiedBound():
+			self._AddCovered(val, val, [val])
+	
+	def AppendValues(self, values):
+		"""Record many primes found outside the sieve"""
+		for val in sorted(set(values)):
+			self.AppendValue(val)
+	
+	def IsInPrimeList(self, val: int):
+		if val <= self.GetVerifiedBound():
+			return val in self._list
+		index = bisect_left(self._sporadic, val)
+		return index < len(self._sporadic) and self._sporadic[index] == val
+	
+	def _CoveringInterval(self, val: int):
+		"""Index of the side-index interval containing val, or -1"""
+		index = bisect_right(self._coveredLows, val) - 1
+		return index if index >= 0 and self._coveredHighs[index] >= val else -1
+	
+	def _AddCovered(self, low: int, high: int, primes):
+		"""Note that primes are exactly the primes in [low, high]; the next save appends it to SPORADIC_FILE"""
+		primes = list(primes)
+		self._MergeCovered(low, high, primes)
+		self._sporadicNew.append((low, high, primes))
+		if len(self._coveredLows) > SPORADIC_LIMIT:
+			self._DropOldestCovered()
+		if self._store is not None:
+			self._AbsorbCovered()
+	
+	def _MergeCovered(self, low: int, high: int, primes):
+		"""Put [low, high] and its primes in the side index as its newest interval, merging touching ones"""
+		first = bisect_left(self._coveredHighs, low - 1)
+		last = bisect_right(self._coveredLows, high + 1)
+		if first < last:
+			low = min(low, self._coveredLows[first])
+			high = max(high, self._coveredHighs[last - 1])
+		self._coveredLows[first:last] = [low]
+		self._coveredHighs[first:last] = [high]
+		self._coveredAges[first:last] = [self._nextAge]
+		self._nextAge += 1
+		for prime in primes:
+			index = bisect_left(self._sporadic, prime)
+			if index == len(self._sporadic) or self._sporadic[index] != prime:
+				self._sporadic.insert(index, prime)
+	
+	def _LoadCovered(self, entries):
+		"""Build the side index from (low, high, primes) entries, oldest first, in one sorted pass"""
+		lows, highs, ages, primes = [], [], [], []
+		for age, (low, high, values) in sorted(enumerate(entries), key=lambda entry: entry[1][0]):
+			if highs and low <= highs[-1] + 1:
+				# Touches the interval before it
+				highs[-1] = max(highs[-1], high)
+				ages[-1] = max(ages[-1], age)
+			else:
+				lows.append(low)
+				highs.append(high)
+				ages.append(age)
+			primes.extend(values)
+		self._coveredLows, self._coveredHighs, self._coveredAges = lows, highs, ages
+		self._sporadic = sorted(set(primes))
+		self._nextAge = len(entries)
+	
+	def _DropOldestCovered(self):
+		"""Forget the least recently added quarter of the side-index intervals"""
+		cutoff = sorted(self._coveredAges)[len(self._coveredAges) // 4]
+		keep = [i for i, age in enumerate(self._coveredAges) if age >= cutoff]
+		sporadic = []
+		for i in keep:
+			sporadic.extend(self._sporadic[bisect_left(self._sporadic, self._coveredLows[i]):bisect_right(self._sporadic, self._coveredHighs[i])])
+		self._sporadic = sporadic
+		self._coveredLows = [self._coveredLows[i] for i in keep]
+		self._coveredHighs = [self._coveredHighs[i] for i in keep]
+		self._coveredAges = [self._coveredAges[i] for i in keep]
+		self._sporadicRewrite = True
+	
+	def _AbsorbCovered(self):
+		"""Move side-index intervals that the verified range has reached into the store"""
+		bound = self._verifiedBound
+		while self._coveredLows and self._coveredLows[0] <= bound + 1:
+			high = self._coveredHighs[0]
+			split = bisect_right(self._sporadic, high)
+			if high > bound:
+				# Every prime of the interval above the bound is also above the stored ones
+				self._store.extend([p for p in self._sporadic[:split] if p > bound])
+				bound = high
+			del self._sporadic[:split]
+			del self._coveredLows[0]
+			del self._coveredHighs[0]
+			del self._coveredAges[0]
+		self._verifiedBound = bound
+	
+	def SieveFlags(self, limit: int):
+		"""Return a bytearray where index i is 1 exactly when i is prime, for 0 <= i <= limit"""
+		sieve = bytearray([1]) * (limit + 1)
+		sieve[:2] = bytes(min(2, limit + 1))
+		for p in range(2, math.isqrt(limit) + 1):
+			if sieve[p]:
+				sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+		return sieve
+	
+	def SieveBasePrimes(self, limit: int):
+		"""Return all primes <= limit using a plain Sieve of Eratosthenes"""
+		if limit < 2:
+			return []
+		return list(compress(range(limit + 1), self.SieveFlags(limit)))
+	
+	def SieveSegment(self, low: int, high: int, basePrimes: list):
+		"""Return the primes in [low, high), given every prime <= isqrt(high - 1) in basePrimes"""
+		return list(compress(range(low, high), self.SieveSegmentFlags(low, high, basePrimes)))
+	
+	def SieveSegmentFlags(self, low: int, high: int, basePrimes: list):
+		"""Return a bytearray where index i is 1 exactly when low + i is prime, for low <= low + i < high"""
+		if high <= low:
+			return bytearray()
+		size = high - low
+		if self._counting:
+			self._counters["sieveSegments"] += 1
+			self._counters["sievedValues"] += size
+		segment = bytearray([1]) * size
+		for p in basePrimes:
+			first = p * p
+			if first >= high:
+				break
+			if first < low:
+				first = low + (-low % p)
+			segment[first - low::p] = bytes(len(range(first - low, size, p)))
+		# 0 and 1 are not prime
+		for x in range(low, min(high, 2)):
+			segment[x - low] = 0
+		return segment
+	
+	def ParallelSegments(self, worker, start: int, end: int, basePrimes: list, workers: int, progress=None, cancel: CancelToken = None):
+		"""Run worker over [start, end] in WORKER_CHUNK blocks on a process pool, yielding results in order"""
+		from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+		import multiprocessing
+		stopWorkers = multiprocessing.Event()
+		chunks = iter(range(start, end + 1, WORKER_CHUNK))
+		# (future, end of its block) for the blocks submitted and not yet yielded
+		pending = deque()
+		done = start
+		executor = ProcessPoolExecutor(workers, initializer=_InitWorker, initargs=(basePrimes, stopWorkers))
+		try:
+			while True:
+				# Keep every worker busy without queueing the whole range up front
+				while len(pending) < 2 * workers:
+					low = next(chunks, None)
+					if low is None:
+						break
+					high = min(low + WORKER_CHUNK, end + 1)
+					pending.append((executor.submit(worker, low, high), high))
+				if not pending:
+					return
+				
+				# Wait briefly on the oldest block so cancellation and progress stay responsive
+				try:
+					result = pending[0][0].result(timeout=0.1)
+				except FutureTimeoutError:
+					result = None
+				else:
+					done = pending.popleft()[1]
+				# Check for cancellation
+				if cancel is not None and cancel.cancelled:
+					raise InterruptException("Calculation interrupted by user")
+				if progress:
+					progress(done - start, end + 1 - start)
+				if result is not None:
+					yield result
+		finally:
+			# Stop workers between segments and drop tasks that have not started
+			stopWorkers.set()
+			for future, _ in pending:
+				future.cancel()
+			executor.shutdown(wait=True)
+	
+	def IterPrimes(self, start: int, end: int, progress=None, workers: int = 1, cancel: CancelToken = None, cache: bool = True):
+		"""Yield the primes in [start, end] in ascending chunks, reading the cache first and then sieving;
+		sieved segments that continue the cache are added to it as they complete, unless cache is False.
+		progress(done, total) is called with the number of values sieved after each segment"""
+		currentMax = self.GetMax()
+		if start <= currentMax:
+			first = self._list.bisect_left(start)
+			last = self._list.bisect_right(end)
+			for index in range(first, last, SEGMENT_SIZE):
+				yield self._list[index:min(index + SEGMENT_SIZE, last)]
+		
+		# Sieving resumes after the verified bound, which may lie past the last stored prime
+		resume = self._verifiedBound + 1
+		low = max(start, resume, 2)
+		if low > end:
+			return
+		# Only a sieve that picks up right where the cache stops may extend it
+		extend = cache and low == max(resume, 2)
+		basePrimes = self.SieveBasePrimes(math.isqrt(end))
+		if workers > 1:
+			blocks = self.ParallelSegments(_SievePrimesWorker, low, end, basePrimes, workers, progress, cancel)
+			# Blocks arrive in order, so each one extends the sorted list directly
+			for blockLow, primes in zip(range(low, end + 1, WORKER_CHUNK), blocks):
+				if extend:
+					self._ExtendVerified(primes, min(blockLow + WORKER_CHUNK - 1, end))
+				yield primes
+			return
+		for segLow in range(low, end + 1, SEGMENT_SIZE):
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			segHigh = min(segLow + SEGMENT_SIZE, end + 1)
+			primes = self.SieveSegment(segLow, segHigh, basePrimes)
+			if extend:
+				self._ExtendVerified(primes, segHigh - 1)
+			yield primes
+			if progress:
+				progress(segHigh - low, end + 1 - low)
+	
+	def _ExtendVerified(self, primes, bound: int):
+		"""Append the sieved primes up to bound, then checkpoint if one is due"""
+		# Side-index intervals absorbed along the way may already have carried the bound further
+		if bound <= self._verifiedBound:
+			return
+		# Every prime past the bound is above the stored ones, so the list stays sorted
+		self._list.extend(primes[bisect_right(primes, self._verifiedBound):])
+		self._verifiedBound = bound
+		self._AbsorbCovered()
+		self.Checkpoint()
+	
+	def UpdatePrimesToValue(self, maxVal: int, progress=None, workers: int = 1, cancel: CancelToken = None):
+		"""Extend the list with every prime up to maxVal using a segmented sieve, on `workers` processes"""
+		for _ in self.IterPrimes(self.GetVerifiedBound() + 1, maxVal, progress, workers, cancel):
+			pass
+	
+	def IsDivisibleBy3(self, num: int):
+		if num < 1000:
+			return num % 3 == 0
+		
+		return self.IsDivisibleBy3(sum(self.ConvertIntToDigitList(num)))
+	
+	def IsDivisibleBy5(self, num: int):
+		return ((self.ConvertIntToDigitList(num)[-1:][0]) % 5 == 0)
+	
+	# Modified from https://www.geeksforgeeks.org/divisibility-by-7/
+	# Function to check whether a number is divisible by 7
+	def IsDivisibleBy7(self, num: int): 
+		if num < 1000 : 
+			return num % 7 == 0
+		
+		numList = self.ConvertIntToDigitList(num)
+		topNum = self.ConvertListToInt(numList[:-1])
+		botNum = numList[-1:][0] * 2
+		return self.IsDivisibleBy7(topNum - botNum)
+
+	# Modified from https://www.geeksforgeeks.org/check-large-number-divisible-11-not/
+	# Function to find that number divisible by 11 or not
+	def IsDivisibleBy11(self, num: int):
+		numList = self.ConvertIntToDigitList(num)
+		
+		# Compute sum of even and odd digit
+		# sums
+		oddDigSum = sum(numList[0::2])
+		evenDigSum = sum(numList[1::2])
+		
+		# Check its difference is divisible by 11 or not
+		return ((oddDigSum - evenDigSum) % 11 == 0)
+	
+	def IsDivisibleBy13(self, num: int):
+		if num < 1000:
+			return num % 13 == 0
+		
+		numList = self.ConvertIntToDigitList(num)
+		topNum = self.ConvertListToInt(numList[:-1])
+		botNum = numList[-1:][0] * 4
+		
+		return self.IsDivisibleBy13(topNum + botNum)
+	
+	def PossiblyPrime(self, val: int):
+		# Checks if a number is prime based on the basic values (2, 3, 5, 7, 11, and 13)
+		if val < 2:
+			if self._counting:
+				self._counters["possiblyPrimeRejects"] += 1
+			return False
+		
+		# Plain modulo: far cheaper than the digit-based IsDivisibleBy tests
+		for prime in (2, 3, 5, 7, 11, 13):
+			if val % prime == 0:
+				if val != prime:
+					if self._counting:
+						self._counters["possiblyPrimeRejects"] += 1
+				return val == prime
+		
+		return True
+	
+	def IsPrimeMany(self, values: list, cancel: CancelToken = None):
+		"""Primality of many values at once. With NumPy, whole arrays are masked by the small primes
+		and survivors are trial-divided together by cached primes; otherwise each goes to IsPrimeLarge"""
+		np = _NumPy()
+		if np is None or not values or min(values) < 0 or max(values) >= 1 << 63:
+			return [self.IsPrimeLarge(val, cancel) for val in values]
+		
+		keys = np.array(values, dtype=np.int64)
+		alive = keys >= 2
+		for p in SMALL_PRIMES:
+			alive &= (keys % p != 0) | (keys == p)
+		# No factor below 200 and below 200^2 means prime
+		isPrime = alive & (keys < SMALL_PRIMES[-1] ** 2)
+		alive &= ~isPrime
+		
+		# Batch trial division pays off only while sqrt(value) stays small and inside the cache
+		divisorLimit = min(TRIAL_BATCH_LIMIT, self.GetMax())
+		covered = alive & (keys <= divisorLimit * divisorLimit)
+		index = np.flatnonzero(covered)
+		if len(index):
+			candidates = keys[index]
+			survivors = np.ones(len(index), dtype=bool)
+			divisors = self.PrimesUpTo(math.isqrt(int(candidates.max())))
+			for p in divisors[bisect_right(divisors, SMALL_PRIMES[-1]):]:
+				# Check for cancellation
+				if cancel is not None and cancel.cancelled:
+					raise InterruptException("Calculation interrupted by user")
+				
+				survivors &= (candidates % p != 0) | (candidates == p)
+			isPrime[index[survivors]] = True
+		
+		# Whatever is left is too large for trial division: Miller-Rabin on each survivor
+		for i in np.flatnonzero(alive & ~covered).tolist():
+			isPrime[i] = self.IsPrimeLarge(values[i], cancel)
+		return isPrime.tolist()
+	
+	def DefinitelyPrime(self, val: int, cancel: CancelToken = None):
+		topRange = math.isqrt(val)
+		# Trial division proves primality only when every prime up to the root is stored
+		if self.GetVerifiedBound() < topRange:
+			return self.IsPrimeLarge(val, cancel)
+		divisors = self.PrimesUpTo(topRange)
+		for count, x in enumerate(divisors):
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			if x > 13 and x < val:
+				if val % x == 0:
+					if self._counting:
+						self._counters["trialDivisions"] += count + 1
+					return False
+		if self._counting:
+			self._counters["trialDivisions"] += len(divisors)
+		return True
+	
+	def IsPrime(self, val: int, cancel: CancelToken = None):
+		if self.PossiblyPrime(val):
+			if val <= 17:
+				return True
+			if self.DefinitelyPrime(val, cancel):
+				return True
+		return False
+	
+	# New functions for large prime numbers (>10,000,000)
+	
+	def IsDivisibleBy17(self, num: int):
+		if num < 1000:
+			return num % 17 == 0
+		
+		numList = self.ConvertIntToDigitList(num)
+		topNum = self.ConvertListToInt(numList[:-1])
+		botNum = numList[-1:][0] * 5
+		
+		return self.IsDivisibleBy17(topNum - botNum)
+	
+	def IsDivisibleBy19(self, num: int):
+		if num < 1000:
+			return num % 19 == 0
+		
+		numList = self.ConvertIntToDigitList(num)
+		topNum = self.ConvertListToInt(numList[:-1])
+		botNum = numList[-1:][0] * 2
+		
+		return self.IsDivisibleBy19(topNum + botNum)
+	
+	def PossiblyPrimeLarge(self, val: int):
+		"""Enhanced divisibility tests for large numbers: True if val has no prime factor below 200"""
+		return math.gcd(val, SMALL_PRIMORIAL) == 1
+	
+	def IsPrimeBatch(self, values, cancel: CancelToken = None):
+		"""Yield whether each value is prime, in input order; cached values are looked up together,
+		the rest go through IsPrimeLarge"""
+		values = iter(values)
+		while True:
+			chunk = list(islice(values, BATCH_SIZE))
+			if not chunk:
+				return
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			bound = self.GetMax()
+			cached = iter(self._list.ContainsMany([val for val in chunk if val <= bound]))
+			uncached = iter(self.IsPrimeMany([val for val in chunk if val > bound], cancel))
+			for val in chunk:
+				yield next(cached) if val <= bound else next(uncached)
+	
+	def StrongProbablePrime(self, n: int, a: int):
+		"""Miller-Rabin round: False if witness a proves the odd number n composite"""
+		if self._counting:
+			self._counters["millerRabinRounds"] += 1
+		a %= n
+		if a == 0:
+			return True
+		
+		# Write n as 2^r * d + 1
+		r, d = 0, n - 1
+		while d % 2 == 0:
+			r += 1
+			d //= 2
+		
+		x = pow(a, d, n)
+		if x == 1 or x == n - 1:
+			return True
+		for _ in range(r - 1):
+			x = (x * x) % n
+			if x == n - 1:
+				return True
+		return False
+	
+	def MillerRabinTest(self, n: int, bases=None, cancel: CancelToken = None):
+		"""Miller-Rabin primality test; exact for n < 3.3e24 when bases is not given"""
+		if n <= 3:
+			return n > 1
+		if n % 2 == 0:
+			return False
+		
+		if bases is None:
+			bases = MILLER_RABIN_WITNESSES[-1][1]
+			for bound, witnesses in MILLER_RABIN_WITNESSES:
+				if n < bound:
+					bases = witnesses
+					break
+		
+		# Witness loop
+		for a in bases:
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			if not self.StrongProbablePrime(n, a):
+				return False
+		return True
+	
+	def JacobiSymbol(self, a: int, n: int):
+		"""Jacobi symbol (a/n) for odd positive n"""
+		a %= n
+		result = 1
+		while a:
+			while a % 2 == 0:
+				a //= 2
+				if n % 8 in (3, 5):
+					result = -result
+			a, n = n, a
+			if a % 4 == 3 and n % 4 == 3:
+				result = -result
+			a %= n
+		return result if n == 1 else 0
+	
+	def StrongLucasProbablePrime(self, n: int):
+		"""Strong Lucas probable-prime test with Selfridge's parameters, for odd n > 2"""
+		if self._counting:
+			self._counters["lucasTests"] += 1
+		root = math.isqrt(n)
+		if root * root == n:
+			return False
+		
+		# Selfridge: first D in 5, -7, 9, -11, ... with (D/n) = -1
+		D = 5
+		while True:
+			jacobi = self.JacobiSymbol(D, n)
+			if jacobi == -1:
+				break
+			if jacobi == 0 and abs(D) != n:
+				return False
+			D = -D - 2 if D > 0 else -D + 2
+		P, Q = 1, (1 - D) // 4
+		
+		# Write n + 1 as 2^s * d
+		s, d = 0, n + 1
+		while d % 2 == 0:
+			s += 1
+			d //= 2
+		
+		def half(x):
+			# Division by 2 modulo the odd number n
+			return (x + n if x % 2 else x) // 2 % n
+		
+		# Left-to-right binary evaluation of U_d, V_d and Q^d
+		U, V, Qk = 1, P, Q % n
+		for bit in bin(d)[3:]:
+			U, V, Qk = (U * V) % n, (V * V - 2 * Qk) % n, (Qk * Qk) % n
+			if bit == '1':
+				U, V = half(P * U + V), half(D * U + P * V)
+				Qk = (Qk * Q) % n
+		
+		if U == 0 or V == 0:
+			return True
+		for _ in range(s - 1):
+			V = (V * V - 2 * Qk) % n
+			Qk = (Qk * Qk) % n
+			if V == 0:
+				return True
+		return False
+	
+	def BailliePSWTest(self, n: int):
+		"""Baillie-PSW test: a base-2 strong probable-prime test plus a strong Lucas test"""
+		if n < 2:
+			return False
+		if n in SMALL_PRIMES:
+			return True
+		if not self.PossiblyPrimeLarge(n):
+			return False
+		return self.StrongProbablePrime(n, 2) and self.StrongLucasProbablePrime(n)
+	
+	def IsPrimeLarge(self, val: int, cancel: CancelToken = None, remember: bool = True):
+		"""Optimized prime check for large numbers (>10,000,000); deterministic for every input. With
+		remember False the result cache is left alone, for callers that keep the answer elsewhere"""
+		if val < 2:
+			return False
+		
+		# Quick divisibility tests: a single gcd against the primorial of the primes below 200
+		if not self.PossiblyPrimeLarge(val):
+			if self._counting:
+				self._counters["smallFactorRejects"] += 1
+			return val in SMALL_PRIMES
+		if val < SMALL_PRIMES[-1] ** 2:
+			return True
+		
+		remember = remember and val >= RESULT_CACHE_MIN_VALUE
+		if remember:
+			isPrime = self._results.Get("isprime", val)
+			if isPrime is not None:
+				return isPrime
+		# Known witness sets are exact below 3.3e24; beyond that, Baillie-PSW
+		if val < MILLER_RABIN_WITNESSES[-1][0]:
+			isPrime = self.MillerRabinTest(val, cancel=cancel)
+		else:
+			isPrime = self.BailliePSWTest(val)
+		# Composites nearly always fail the first witness, for less than the bookkeeping of an entry
+		# would save; only primes, which run every round, are kept
+		if isPrime and remember:
+			self._results.Put("isprime", val, isPrime)
+		return isPrime
+	
+	def WheelFactorization(self, val: int, cancel: CancelToken = None):
+		"""Wheel factorization for efficient large number testing"""
+		if val < 2:
+			return False
+		if val < 4:
+			return True
+		if val % 2 == 0:
+			return False
+		
+		# Wheel of 30: only test numbers ≡ 1, 7, 11, 13, 17, 19, 23, 29 (mod 30)
+		wheel = [1, 7, 11, 13, 17, 19, 23, 29]
+		limit = math.isqrt(val)
+		
+		# Test small primes first
+		for prime in [3, 5, 7, 11, 13, 17, 19, 23, 29]:
+			if val % prime == 0:
+				return val == prime
+		
+		# Wheel factorization
+		for i in range(31, limit + 1, 30):
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			for j in wheel:
+				if i + j > limit:
+					break
+				if val % (i + j) == 0:
+					return False
+		return True
+	
+	def _SearchWindow(self, low: int, high: int, descending: bool = False):
+		"""Yield the primes in [low, high), ascending or descending: sieve out small factors, then test survivors.
+		The primes found go to the side index, so they are kept out of the result cache"""
+		root = math.isqrt(high - 1)
+		limit = min(root, high - low, WINDOW_SIEVE_LIMIT)
+		if limit <= SMALL_PRIMES[-1]:
+			# The gcd prefilter in IsPrimeLarge already rejects multiples of these primes
+			candidates = range(low | 1, high, 2)
+			if low <= 2 < high:
+				candidates = chain((2,), candidates)
+			candidates = reversed(list(candidates)) if descending else candidates
+			for candidate in candidates:
+				if self.IsPrimeLarge(candidate, remember=False):
+					yield candidate
+			return
+		
+		if self._windowPrimes is None:
+			self._windowPrimes = self.SieveBasePrimes(WINDOW_SIEVE_LIMIT)
+		basePrimes = self._windowPrimes[:bisect_right(self._windowPrimes, limit)]
+		# When every prime up to sqrt(high) took part in the sieve, the survivors need no test
+		complete = root <= limit
+		flags = self.SieveSegmentFlags(low, high, basePrimes)
+		if descending:
+			candidates = compress(range(high - 1, low - 1, -1), reversed(flags))
+		else:
+			candidates = compress(range(low, high), flags)
+		for candidate in candidates:
+			if complete or self.IsPrimeLarge(candidate, remember=False):
+				yield candidate
+	
+	def FindNextPrime(self, start: int, progress=None, cancel: CancelToken = None):
+		"""Find the next prime number after start; progress(done, None) gets the number of values searched"""
+		if start < 2:
+			return 2
+		
+		# Answer straight from the cache when the next prime is already stored
+		if start < self.GetMax():
+			return self._list.NextAbove(start)
+		
+		# An earlier lookup may have covered the values right after start; the side index keeps every
+		# answer, so the result cache would only hold a second copy
+		low = start + 1
+		covered = self._CoveringInterval(low)
+		if covered >= 0:
+			index = bisect_right(self._sporadic, start)
+			if index < len(self._sporadic) and self._sporadic[index] <= self._coveredHighs[covered]:
+				return self._sporadic[index]
+			low = self._coveredHighs[covered] + 1
+		
+		# Search a window ahead of start, doubling it until a prime turns up
+		window = max(PRIME_SEARCH_WINDOW, 2 * start.bit_length())
+		while True:
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			for prime in self._SearchWindow(low, low + window):
+				# Nothing between start and the new prime is prime; keep that for later lookups
+				self._AddCovered(start + 1, prime, [prime])
+				return prime
+			low += window
+			window = min(window * 2, SEGMENT_SIZE)
+			if progress:
+				progress(low - start - 1, None)
+	
+	def FindPreviousPrime(self, start: int, progress=None, cancel: CancelToken = None):
+		"""Find the previous prime number before start (start itself counts when it is prime);
+		progress(done, None) gets the number of values searched"""
+		if start <= 2:
+			return None
+		
+		# Answer straight from the cache when start is inside the sieved range
+		if start <= self.GetVerifiedBound():
+			return self._list.PreviousAtMost(start)
+		
+		# An earlier lookup may have covered the values right up to start
+		high = start + 1
+		covered = self._CoveringInterval(start)
+		if covered >= 0:
+			index = bisect_right(self._sporadic, start) - 1
+			if index >= 0 and self._sporadic[index] >= self._coveredLows[covered]:
+				return self._sporadic[index]
+			high = self._coveredLows[covered]
+		
+		# Search a window behind start, doubling it until a prime turns up
+		window = max(PRIME_SEARCH_WINDOW, 2 * start.bit_length())
+		while high > 2:
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			low = max(high - window, 2)
+			for prime in self._SearchWindow(low, high, descending=True):
+				# Nothing between the new prime and start is prime; keep that for later lookups
+				self._AddCovered(prime, start, [prime])
+				return prime
+			high = low
+			window = min(window * 2, SEGMENT_SIZE)
+			if progress:
+				progress(start + 1 - high, None)
+		
+		return None
+	
+	def CountPrimesUpTo(self, x: int, progress=None, cancel: CancelToken = None):
+		"""Prime-counting function pi(x) by Lucy_Hedgehog's method, in O(x^(3/4)) time and O(sqrt(x)) memory"""
+		if x < 2:
+			return 0
+		if self._counting:
+			self._counters["primeCountingRuns"] += 1
+		r = math.isqrt(x)
+		basePrimes = self.SieveBasePrimes(r)
+		
+		np = _NumPy()
+		# small[v] = S(v) and large[i] = S(x // i), where S(v) starts as the count of 2..v and
+		# ends as the count of primes <= v once every p <= sqrt(x) has been sieved out
+		if np is not None and x < 1 << 63:
+			small = np.arange(-1, r, dtype=np.int64)
+			large = np.zeros(r + 1, dtype=np.int64)
+			large[1:] = x // np.arange(1, r + 1, dtype=np.int64) - 1
+		else:
+			small = list(range(-1, r))
+			large = [0] + [x // i - 1 for i in range(1, r + 1)]
+		small[0] = 0
+		
+		for count, p in enumerate(basePrimes):
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			sp = int(small[p - 1])
+			p2 = p * p
+			lim = min(r, x // p2)
+			mid = min(lim, r // p)
+			# Values on the right are all read before any is updated
+			if np is not None and isinstance(large, np.ndarray):
+				large[1:mid + 1] -= large[p:mid * p + 1:p] - sp
+				if lim > mid:
+					large[mid + 1:lim + 1] -= small[x // (np.arange(mid + 1, lim + 1, dtype=np.int64) * p)] - sp
+				if p2 <= r:
+					small[p2:] -= small[np.arange(p2, r + 1, dtype=np.int64) // p] - sp
+			else:
+				large[1:mid + 1] = [large[i] - large[i * p] + sp for i in range(1, mid + 1)]
+				large[mid + 1:lim + 1] = [large[i] - small[x // (i * p)] + sp for i in range(mid + 1, lim + 1)]
+				if p2 <= r:
+					small[p2:] = [small[v] - small[v // p] + sp for v in range(p2, r + 1)]
+			# Later primes update fewer values, so this overstates the work left
+			if progress and count % 100 == 0:
+				progress(count, len(basePrimes))
+		
+		return int(large[1])
+	
+	def CountPrimesInRange(self, start: int, end: int, progress=None, workers: int = 1, cancel: CancelToken = None):
+		"""Count prime numbers in a range (inclusive); sieved ranges are split across `workers` processes.
+		progress(done, total) is called after each sieved segment, or every 100 sieving primes of pi(x)"""
+		start = max(start, 2)
+		if end < start:
+			return 0
+		
+		# Inside the sieved range the store answers by bisection (popcount with --bitmap)
+		if end <= self.GetVerifiedBound():
+			return self._list.bisect_right(end) - self._list.bisect_left(start)
+		
+		# pi(end) - pi(start - 1) costs O(end^(3/4)) no matter the span; sieving costs O(span),
+		# and is the better deal for short spans (much more so without NumPy)
+		lucyCost = end ** 0.75 * (2 if start > 2 else 1) * (1 if _NumPy() is not None else LUCY_PURE_PYTHON_PENALTY)
+		if end >= SEGMENT_SIZE and end - start > lucyCost:
+			count = self.CountPrimesUpTo(end, progress, cancel)
+			if start > 2:
+				count -= self.CountPrimesUpTo(start - 1, progress, cancel)
+			return count
+		
+		count = 0
+		basePrimes = self.SieveBasePrimes(math.isqrt(end))
+		if workers > 1:
+			try:
+				for blockCount in self.ParallelSegments(_CountPrimesWorker, start, end, basePrimes, workers, progress, cancel):
+					count += blockCount
+			except InterruptException:
+				raise InterruptException("Calculation interrupted by user", count)
+			return count
+		for low in range(start, end + 1, SEGMENT_SIZE):
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user", count)
+			
+			high = min(low + SEGMENT_SIZE, end + 1)
+			count += self.SieveSegmentFlags(low, high, basePrimes).count(1)
+			if progress:
+				progress(high - start, end + 1 - start)
+		
+		return count
+	
+	def _ScanGaps(self, start: int, end: int, distances: tuple, progress=None, workers: int = 1, cancel: CancelToken = None):
+		"""Single pass over the primes in [start, end], holding one chunk at a time; nothing sieved is added to
+		the cache. Returns the number of primes, the first and last of them, a Counter of gaps between
+		consecutive primes, the first prime followed by each gap size, and for each k in distances the
+		number of pairs (p, p + k) both prime"""
+		np = _NumPy() if end < 1 << 63 else None
+		histogram = Counter()
+		firstGap = {}
+		pairs = dict.fromkeys(distances, 0)
+		# At most k / 2 primes follow p up to p + k, so that many primes from the previous chunk
+		# are carried over for gaps and pairs that straddle chunks
+		reach = max(max(distances, default=0) // 2, 1)
+		carry = []
+		count = 0
+		first = last = None
+		for chunk in self.IterPrimes(start, end, progress, workers, cancel, cache=False):
+			if not len(chunk):
+				continue
+			count += len(chunk)
+			if first is None:
+				first = int(chunk[0])
+			last = int(chunk[-1])
+			if np is not None:
+				values = np.concatenate((np.array(carry, dtype=np.int64), np.asarray(chunk, dtype=np.int64)))
+				lead = max(len(carry) - 1, 0)
+				sizes, index, counts = np.unique(np.diff(values[lead:]), return_index=True, return_counts=True)
+				for size, i, n in zip(sizes.tolist(), index.tolist(), counts.tolist()):
+					histogram[size] += n
+					if size not in firstGap:
+						firstGap[size] = int(values[lead + i])
+				# Pairs j primes apart whose upper prime is new in this chunk
+				for j in range(1, reach + 1):
+					skip = max(len(carry) - j, 0)
+					spans = values[j + skip:] - values[skip:len(values) - j]
+					for k in distances:
+						pairs[k] += int(np.count_nonzero(spans == k))
+				carry = values[-reach:].tolist()
+			else:
+				recent = deque(carry, maxlen=reach)
+				for q in chunk:
+					if recent:
+						size = q - recent[-1]
+						histogram[size] += 1
+						if size not in firstGap:
+							firstGap[size] = recent[-1]
+					for k in distances:
+						if q - k in recent:
+							pairs[k] += 1
+					recent.append(q)
+				carry = list(recent)
+		return count, first, last, histogram, firstGap, pairs
+	
+	def PrimeGapStats(self, start: int, end: int, progress=None, workers: int = 1, cancel: CancelToken = None):
+		"""Gap and prime-pair statistics for the primes in [start, end], in one streaming pass (vectorized
+		with NumPy): counts, largest and mean gap, a histogram of gaps with the first prime before each
+		size, and the number of twin, cousin and sexy pairs with both primes in the range"""
+		count, first, last, histogram, firstGap, pairs = self._ScanGaps(start, end, tuple(k for k, _ in PRIME_PAIRS), progress, workers, cancel)
+		maxGap = max(histogram, default=None)
+		stats = {
+			"primes": count,
+			"first": first,
+			"last": last,
+			"maxGap": maxGap,
+			"maxGapAfter": firstGap.get(maxGap),
+			"meanGap": (last - first) / (count - 1) if count > 1 else None,
+			"histogram": dict(sorted(histogram.items())),
+			"firstOccurrence": dict(sorted(firstGap.items())),
+		}
+		for k, name in PRIME_PAIRS:
+			stats[name] = pairs[k]
+		return stats
+	
+	def CountPrimePairs(self, start: int, end: int, distance: int = 2, progress=None, workers: int = 1, cancel: CancelToken = None):
+		"""Number of pairs (p, p + distance) of primes with both in [start, end]: twin primes for 2,
+		cousin primes for 4, sexy primes for 6"""
+		return self._ScanGaps(start, end, (distance,), progress, workers, cancel)[5][distance]
+	
+	def FindPrimeGap(self, gap: int, start: int = 2, end: int = None, progress=None, cancel: CancelToken = None):
+		"""First prime p >= start whose next prime is p + gap, or None if there is none with p + gap <= end;
+		without end the search goes on until one is found"""
+		# Every gap after 2 is even
+		if gap < 1 or (gap % 2 and gap != 1):
+			return None
+		base = low = max(start, 2)
+		previous = None
+		# Searched block by block so an open-ended search still moves in bounded steps
+		while end is None or low <= end:
+			high = low + WORKER_CHUNK - 1 if end is None else min(low + WORKER_CHUNK - 1, end)
+			count, first, last, _, firstGap, _ = self._ScanGaps(low, high, (), None, 1, cancel)
+			if count:
+				# The gap from the previous block's last prime to this block's first
+				if previous is not None and first - previous == gap:
+					return previous
+				if gap in firstGap:
+					return firstGap[gap]
+				previous = last
+			if progress:
+				progress(high + 1 - base, None if end is None else end + 1 - base)
+			low = high + 1
+		return None
+	
+	def _AddPiCheckpoint(self, x: int, count: int):
+		"""Remember that pi(x) == count"""
+		index = bisect_left(self._piBounds, x)
+		if index < len(self._piBounds) and self._piBounds[index] == x:
+			return
+		self._piBounds.insert(index, x)
+		self._piCounts.insert(index, count)
+		self._piDirty = True
+	
+	def _LucyCost(self, x: int):
+		"""Sieving span that costs about as much as computing pi(x) outright"""
+		return x ** 0.75 * (1 if _NumPy() is not None else LUCY_PURE_PYTHON_PENALTY)
+	
+	def LogIntegral(self, x: float):
+		"""Logarithmic integral li(x) for x > 1, by Ramanujan's series"""
+		logX = math.log(x)
+		total, term, inner = 0.0, -1.0, 0.0
+		for k in range(1, 1000):
+			term *= -logX / k
+			if (k - 1) % 2 == 0:
+				inner += 1 / k
+			delta = term / 2 ** (k - 1) * inner
+			total += delta
+			if abs(delta) < 1e-12 * abs(total):
+				break
+		return 0.5772156649015329 + math.log(logX) + math.sqrt(x) * total
+	
+	def InverseLogIntegral(self, n: int):
+		"""Integer x with li(x) close to n, an estimate of the n-th prime good to about sqrt(x) log(x)"""
+		if n < 6:
+			return (2, 3, 5, 7, 11)[max(n, 1) - 1]
+		# Newton's method from the first terms of Cipolla's expansion; li'(x) = 1 / log(x)
+		x = n * (math.log(n) + math.log(math.log(n)) - 1)
+		for _ in range(100):
+			step = (self.LogIntegral(x) - n) * math.log(x)
+			x -= step
+			if abs(step) < 1:
+				break
+		return int(x)
+	
+	def PrimePi(self, x: int, progress=None, cancel: CancelToken = None):
+		"""Number of primes <= x: a bisection inside the sieved range; past it, a sieve from the nearest
+		pi checkpoint when one is close, or the prime-counting function. Answers become checkpoints"""
+		if x < 2:
+			return 0
+		if x <= self.GetVerifiedBound():
+			return self._list.bisect_right(x)
+		
+		# Closest known pi below x: the end of the sieved range, or a checkpoint past it
+		low, lowCount = self._verifiedBound, len(self._list)
+		index = bisect_right(self._piBounds, x)
+		if index and self._piBounds[index - 1] >= low:
+			low, lowCount = self._piBounds[index - 1], self._piCounts[index - 1]
+		if low == x:
+			return lowCount
+		high = self._piBounds[index] if index < len(self._piBounds) else None
+		
+		reach = self._LucyCost(x)
+		if high is not None and high - x < x - low and high - x <= reach:
+			count = self._piCounts[index] - self.CountPrimesInRange(x + 1, high, progress, 1, cancel)
+		elif x - low <= reach:
+			count = lowCount + self.CountPrimesInRange(low + 1, x, progress, 1, cancel)
+		else:
+			count = self.CountPrimesUpTo(x, progress, cancel)
+		self._AddPiCheckpoint(x, count)
+		return count
+	
+	def NthPrime(self, n: int, progress=None, cancel: CancelToken = None):
+		"""The n-th prime (NthPrime(1) == 2), or None for n < 1: an index into the sieved range; past it,
+		a sieve from the nearest pi checkpoint, or from li^-1(n) when no checkpoint is close"""
+		if n < 1:
+			return None
+		stored = len(self._list)
+		if n <= stored:
+			return int(self._list[n - 1])
+		
+		# Closest known pi below the answer: the end of the sieved range, or a checkpoint past it
+		low, lowCount = self._verifiedBound, stored
+		index = bisect_left(self._piCounts, n)
+		if index and self._piBounds[index - 1] >= low:
+			low, lowCount = self._piBounds[index - 1], self._piCounts[index - 1]
+		estimate = self.InverseLogIntegral(n)
+		if estimate - low > self._LucyCost(estimate):
+			# Too far to sieve: count up to the estimate, which lands within a few segments
+			low, lowCount = estimate, self.PrimePi(estimate, progress, cancel)
+		
+		# p_n < n (log n + log log n) for n >= 6 (Rosser), so these base primes cover the whole walk
+		upper = max(int(n * (math.log(n) + math.log(math.log(n)))) + 1 if n >= 6 else 13, low + SEGMENT_SIZE)
+		basePrimes = self.SieveBasePrimes(math.isqrt(upper))
+		prime = None
+		if lowCount < n:
+			# Walk up from low: the answer is the (n - lowCount)-th prime past it
+			segLow = low + 1
+			while prime is None:
+				# Check for cancellation
+				if cancel is not None and cancel.cancelled:
+					raise InterruptException("Calculation interrupted by user")
+				
+				primes = self.SieveSegment(segLow, segLow + SEGMENT_SIZE, basePrimes)
+				if lowCount + len(primes) >= n:
+					prime = primes[n - lowCount - 1]
+				lowCount += len(primes)
+				segLow += SEGMENT_SIZE
+				if progress:
+					progress(segLow - low - 1, None)
+		else:
+			# The estimate overshot: walk down, with lowCount the number of primes <= segHigh
+			segHigh = low
+			while prime is None:
+				# Check for cancellation
+				if cancel is not None and cancel.cancelled:
+					raise InterruptException("Calculation interrupted by user")
+				
+				primes = self.SieveSegment(max(segHigh - SEGMENT_SIZE, 0) + 1, segHigh + 1, basePrimes)
+				if lowCount - len(primes) < n:
+					prime = primes[n - (lowCount - len(primes)) - 1]
+				lowCount -= len(primes)
+				segHigh -= SEGMENT_SIZE
+				if progress:
+					progress(low - segHigh, None)
+		self._AddPiCheckpoint(prime, n)
+		return prime
+	
+	def PrimesBetween(self, start: int, end: int, progress=None, workers: int = 1, cancel: CancelToken = None):
+		"""The primes in [start, end] as a list: sliced from the cache where it reaches, sieved past it"""
+		primes = []
+		for chunk in self.IterPrimes(start, end, progress, workers, cancel):
+			primes.extend(chunk)
+		return primes
+	
+	def IntegerRoot(self, n: int, k: int):
+		"""Largest integer r with r**k <= n"""
+		if n < 2:
+			return n
+		r = 1 << -(-n.bit_length() // k)
+		while True:
+			s = ((k - 1) * r + n // r ** (k - 1)) // k
+			if s >= r:
+				return r
+			r = s
+	
+	def PollardRhoBrent(self, n: int, c: int = 1, maxIterations: int = RHO_ITERATIONS, cancel: CancelToken = None):
+		"""Brent's variant of Pollard's rho; returns a nontrivial factor of n, or None if none was found"""
+		if n % 2 == 0:
+			return 2
+		if self._counting:
+			self._counters["rhoAttempts"] += 1
+		
+		y, r, q, g = 2, 1, 1, 1
+		x = ys = y
+		while g == 1:
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			x = y
+			for _ in range(r):
+				y = (y * y + c) % n
+			k = 0
+			while k < r and g == 1:
+				ys = y
+				# Batch the differences so only one gcd is taken per block
+				for _ in range(min(RHO_BLOCK_SIZE, r - k)):
+					y = (y * y + c) % n
+					q = q * abs(x - y) % n
+				g = math.gcd(q, n)
+				k += RHO_BLOCK_SIZE
+			r *= 2
+			if g == 1 and r > maxIterations:
+				return None
+		
+		if g == n:
+			# The block overshot; step from its start one value at a time
+			while True:
+				ys = (ys * ys + c) % n
+				g = math.gcd(abs(x - ys), n)
+				if g > 1:
+					break
+		return g if g != n else None
+	
+	def _EcmCurve(self, n: int, sigma: int, stage1: list, babySteps: list, giantSteps: list, D: int):
+		"""Run both ECM stages on one Montgomery curve (Suyama parametrization); returns a factor or None"""
+		if self._counting:
+			self._counters["ecmCurves"] += 1
+		u = (sigma * sigma - 5) % n
+		v = (4 * sigma) % n
+		X, Z = pow(u, 3, n), pow(v, 3, n)
+		numer = pow(v - u, 3, n) * (3 * u + v) % n
+		denom = 16 * pow(u, 3, n) * v % n
+		g = math.gcd(denom, n)
+		if g != 1:
+			return g if g != n else None
+		a24 = numer * pow(denom, -1, n) % n
+		
+		def dbl(X, Z):
+			t1 = (X + Z) * (X + Z) % n
+			t2 = (X - Z) * (X - Z) % n
+			t3 = t1 - t2
+			return t1 * t2 % n, t3 * (t2 + a24 * t3) % n
+		
+		def add(XP, ZP, XQ, ZQ, XD, ZD):
+			# P + Q given the difference D = P - Q
+			s = (XP - ZP) * (XQ + ZQ)
+			t = (XP + ZP) * (XQ - ZQ)
+			return ZD * (s + t) * (s + t) % n, XD * (s - t) * (s - t) % n
+		
+		def ladder(k, X, Z):
+			X0, Z0 = X, Z
+			X1, Z1 = dbl(X, Z)
+			for bit in bin(k)[3:]:
+				if bit == '1':
+					X0, Z0 = add(X1, Z1, X0, Z0, X, Z)
+					X1, Z1 = dbl(X1, Z1)
+				else:
+					X1, Z1 = add(X0, Z0, X1, Z1, X, Z)
+					X0, Z0 = dbl(X0, Z0)
+			return X0, Z0
+		
+		# Stage 1: multiply the point by every prime power <= B1
+		for pk in stage1:
+			X, Z = ladder(pk, X, Z)
+		g = math.gcd(Z, n)
+		if g != 1:
+			return g if g != n else None
+		
+		# Stage 2: baby-step giant-step; (m*D)Q and jQ share an x-coordinate mod p exactly
+		# when p divides the order of (m*D +- j)Q, so one product covers both primes
+		X2, Z2 = dbl(X, Z)
+		babyPoints = {1: (X, Z)}
+		# (j + 2)Q = jQ + 2Q with difference (j - 2)Q; -Q has the same x-coordinate as Q
+		prevX, prevZ, curX, curZ = X, Z, X, Z
+		for j in range(3, babySteps[-1] + 1, 2):
+			nextX, nextZ = add(curX, curZ, X2, Z2, prevX, prevZ)
+			prevX, prevZ, curX, curZ = curX, curZ, nextX, nextZ
+			babyPoints[j] = (curX, curZ)
+		
+		DX, DZ = ladder(D, X, Z)
+		m = giantSteps[0][0]
+		GX, GZ = ladder(m * D, X, Z)
+		NX, NZ = ladder((m + 1) * D, X, Z)
+		acc = 1
+		for step, js in giantSteps:
+			while m < step:
+				# (m + 2)DQ = (m + 1)DQ + DQ with difference mDQ
+				nextX, nextZ = add(NX, NZ, DX, DZ, GX, GZ)
+				GX, GZ, NX, NZ = NX, NZ, nextX, nextZ
+				m += 1
+			for j in js:
+				jX, jZ = babyPoints[j]
+				acc = acc * (GX * jZ - jX * GZ) % n
+		g = math.gcd(acc, n)
+		return g if 1 < g < n else None
+	
+	def _EcmPlan(self, B1: int):
+		"""Stage 1 prime powers and stage 2 steps for bound B1, shared by every curve at that bound"""
+		if B1 not in self._ecmPlans:
+			D = ECM_GIANT_STEP
+			B2 = ECM_B2_FACTOR * B1
+			flags = self.SieveFlags(B2 + D)
+			stage1 = []
+			for p in compress(range(B1 + 1), flags):
+				pk = p
+				while pk * p <= B1:
+					pk *= p
+				stage1.append(pk)
+			babySteps = [j for j in range(1, D // 2, 2) if math.gcd(j, D) == 1]
+			giantSteps = []
+			for m in range(max(B1 // D, 1), (B2 + D // 2) // D + 1):
+				js = [j for j in babySteps if (B1 < m * D - j <= B2 and flags[m * D - j]) or (B1 < m * D + j <= B2 and flags[m * D + j])]
+				if js:
+					giantSteps.append((m, js))
+			self._ecmPlans[B1] = (stage1, babySteps, giantSteps, D)
+		return self._ecmPlans[B1]
+	
+	def EcmFactor(self, n: int, cancel: CancelToken = None, progress=None):
+		"""Lenstra's elliptic curve method with rising bounds; returns a nontrivial factor of n, or None.
+		progress(done, total) gets the number of curves tried"""
+		sigma = 6
+		totalCurves = sum(curves for _, curves in ECM_SCHEDULE)
+		for B1, curves in ECM_SCHEDULE:
+			plan = self._EcmPlan(B1)
+			for _ in range(curves):
+				# Check for cancellation
+				if cancel is not None and cancel.cancelled:
+					raise InterruptException("Calculation interrupted by user")
+				
+				g = self._EcmCurve(n, sigma, *plan)
+				if g:
+					return g
+				# Curves are chosen in a fixed order so results are reproducible
+				sigma += 1
+				# Later curves use larger bounds, so this understates the time left
+				if progress:
+					progress(sigma - 6, totalCurves)
+		return None
+	
+	def FindFactor(self, n: int, cancel: CancelToken = None, progress=None):
+		"""Find a nontrivial factor of the composite number n"""
+		# Perfect powers defeat both rho and ECM, so peel them off first
+		for k in range(2, n.bit_length()):
+			root = self.IntegerRoot(n, k)
+			if root < 2:
+				break
+			if root ** k == n:
+				return root
+		
+		factor = self.PollardRhoBrent(n, cancel=cancel)
+		if factor is None:
+			factor = self.EcmFactor(n, cancel, progress)
+		c = 2
+		while factor is None:
+			# Fall back to rho with other polynomials and no iteration limit
+			factor = self.PollardRhoBrent(n, c, math.inf, cancel)
+			c += 1
+		return factor
+	
+	def GetPrimeFactors(self, num: int, cancel: CancelToken = None, progress=None):
+		"""Get prime factorization of a number: trial division by cached primes, then Pollard rho and ECM"""
+		if num < 2:
+			return []
+		original = num
+		if original >= RESULT_CACHE_MIN_VALUE:
+			factors = self._results.Get("factors", original)
+			if factors is not None:
+				return factors
+		
+		factors = []
+		# Trial division by the small primes, then by cached primes up to the trial limit
+		cached = self.PrimesUpTo(min(math.isqrt(num), TRIAL_DIVISION_LIMIT))
+		divisions = 0
+		for p in chain(SMALL_PRIMES, cached[bisect_right(cached, SMALL_PRIMES[-1]):]):
+			# Check for cancellation
+			if cancel is not None and cancel.cancelled:
+				raise InterruptException("Calculation interrupted by user")
+			
+			if p * p > num:
+				break
+			divisions += 1
+			while num % p == 0:
+				factors.append(p)
+				num //= p
+		if self._counting:
+			self._counters["trialDivisions"] += divisions
+		
+		if num > 1:
+			factors.extend(self._FactorRemainder(num, cancel, progress))
+		
+		factors.sort()
+		if original >= RESULT_CACHE_MIN_VALUE:
+			self._results.Put("factors", original, factors)
+		return factors
+	
+	def _FactorRemainder(self, num: int, cancel: CancelToken = None, progress=None):
+		"""Prime factors of num > 1 once trial division is done: split it until every piece is prime"""
+		factors = []
+		pending = [num]
+		while pending:
+			num = pending.pop()
+			if self.IsPrimeLarge(num, cancel):
+				factors.append(num)
+			else:
+				factor = self.FindFactor(num, cancel, progress)
+				pending.extend((factor, num // factor))
+		return factors
+	
+	def _SmallFactors(self, values: list):
+		"""For each value, the distinct primes up to TRIAL_DIVISION_LIMIT dividing it. One remainder tree
+		reduces the product of those primes modulo every value at once; a gcd with each remainder is the
+		product of that value's small primes, which a walk down the primes' product tree splits apart"""
+		if not values:
+			return []
+		if self._trialTree is None:
+			if self.GetVerifiedBound() >= TRIAL_DIVISION_LIMIT:
+				trialPrimes = [int(p) for p in self.PrimesUpTo(TRIAL_DIVISION_LIMIT)]
+			else:
+				trialPrimes = self.SieveBasePrimes(TRIAL_DIVISION_LIMIT)
+			self._trialTree = _ProductTree(trialPrimes)
+		primeTree = self._trialTree
+		
+		result = []
+		for val, remainder in zip(values, _RemainderTree(primeTree[-1][0], _ProductTree(values))):
+			g = math.gcd(remainder, val)
+			primes = []
+			stack = [(len(primeTree) - 1, 0)] if g > 1 else []
+			while stack:
+				depth, i = stack.pop()
+				if math.gcd(primeTree[depth][i], g) == 1:
+					continue
+				if depth == 0:
+					primes.append(primeTree[0][i])
+					continue
+				stack.extend((depth - 1, child) for child in (2 * i, 2 * i + 1) if child < len(primeTree[depth - 1]))
+			result.append(primes)
+		return result
+	
+	def GetPrimeFactorsBatch(self, values, workers: int = 1, cancel: CancelToken = None, pool: FactorPool = None):
+		"""Yield the prime factorization of each value, in input order. Small prime factors are found for
+		BATCH_SIZE values at a time with shared product/remainder trees; cofactors that are neither 1 nor
+		prime go to Pollard rho and ECM, on pool when one is given, or else on a pool of `workers`
+		processes started for this call when workers > 1"""
+		from concurrent.futures import TimeoutError as FutureTimeoutError
+		ownPool = pool is None and workers > 1
+		if ownPool:
+			pool = FactorPool(workers)
+		values = iter(values)
+		pending = {}
+		try:
+			while True:
+				chunk = list(islice(values, BATCH_SIZE))
+				if not chunk:
+					return
+				# Check for cancellation
+				if cancel is not None and cancel.cancelled:
+					raise InterruptException("Calculation interrupted by user")
+				
+				results = [None] * len(chunk)
+				# Indices of the values not answered by the result cache
+				todo = []
+				for i, val in enumerate(chunk):
+					cached = self._results.Get("factors", val) if val >= RESULT_CACHE_MIN_VALUE else None
+					if val < 2:
+						results[i] = []
+					elif cached is not None:
+						results[i] = list(cached)
+					else:
+						todo.append(i)
+				
+				# Every prime factor of a cofactor is above the limit, so one below its square is prime
+				pending = {}
+				for i, primes in zip(todo, self._SmallFactors([chunk[i] for i in todo])):
+					num = chunk[i]
+					factors = []
+					for p in primes:
+						while num % p == 0:
+							factors.append(p)
+							num //= p
+					results[i] = factors
+					if num == 1:
+						continue
+					if num < TRIAL_DIVISION_LIMIT ** 2 or self.IsPrimeLarge(num, cancel):
+						factors.append(num)
+					elif pool is not None:
+						pending[i] = pool.executor.submit(_FactorWorker, num)
+					else:
+						factors.extend(self._FactorRemainder(num, cancel))
+				
+				fresh = set(todo)
+				for i, val in enumerate(chunk):
+					if i in pending:
+						while True:
+							# Wait in short steps so cancellation stays responsive
+							try:
+								factors = pending[i].result(timeout=0.1)
+								break
+							except FutureTimeoutError:
+								if cancel is not None and cancel.cancelled:
+									raise InterruptException("Calculation interrupted by user")
+						if factors is None:
+							raise InterruptException("Calculation interrupted by user")
+						results[i].extend(factors)
+					if i in fresh:
+						results[i].sort()
+						if val >= RESULT_CACHE_MIN_VALUE:
+							self._results.Put("factors", val, results[i])
+					yield results[i]
+		finally:
+			# Drop the factorizations nobody will collect that have not started
+			for future in pending.values():
+				future.cancel()
+			if ownPool:
+				# Stop the running ones too
+				pool.Close()
@@ -0,0 +1,72 @@
+"""Tests for cancellation through CancelToken: python -m pytest"""
+import time
+
+import pytest
+
+from primelist import CancelToken, InterruptException, PrimeList
+
+class CancelAfter(CancelToken):
+	"""Token that reports itself cancelled from its checks-th check on"""
+	def __init__(self, checks):
+		super().__init__()
+		self.checks = checks
+	
+	@property
+	def cancelled(self):
+		self.checks -= 1
+		return self.checks < 0
+	
+	@cancelled.setter
+	def cancelled(self, value):
+		if value:
+			self.checks = 0
+
+def cancelled_token():
+	token = CancelToken()
+	token.Cancel()
+	return token
+
+SEMIPRIME = 1000000007 * 1000000009
+
+@pytest.mark.parametrize("call", [
+	lambda pl, token: pl.UpdatePrimesToValue(10 ** 7, cancel=token),
+	lambda pl, token: pl.CountPrimesInRange(10 ** 12, 10 ** 12 + 10 ** 7, cancel=token),
+	lambda pl, token: pl.CountPrimesUpTo(10 ** 10, cancel=token),
+	lambda pl, token: pl.FindNextPrime(10 ** 30, cancel=token),
+	lambda pl, token: pl.FindPreviousPrime(10 ** 30, cancel=token),
+	lambda pl, token: pl.GetPrimeFactors(SEMIPRIME, token),
+	lambda pl, token: list(pl.GetPrimeFactorsBatch([SEMIPRIME] * 3, cancel=token)),
+	lambda pl, token: list(pl.IsPrimeBatch(range(10 ** 12, 10 ** 12 + 100), token)),
+	lambda pl, token: pl.PrimeGapStats(10 ** 9, 10 ** 9 + 10 ** 7, cancel=token),
+])
+def test_cancelled_token_interrupts(call):
+	with pytest.raises(InterruptException):
+		call(PrimeList(resultCacheSize=0), cancelled_token())
+
+def test_interrupted_sieve_keeps_only_whole_segments():
+	pl = PrimeList(resultCacheSize=0)
+	with pytest.raises(InterruptException):
+		pl.UpdatePrimesToValue(10 ** 7, cancel=CancelAfter(3))
+	bound = pl.GetVerifiedBound()
+	assert 0 < bound < 10 ** 7
+	reference = PrimeList(resultCacheSize=0)
+	reference.UpdatePrimesToValue(bound)
+	assert list(pl._list) == list(reference._list)
+
+def test_interrupted_range_count_reports_a_partial_count():
+	pl = PrimeList(resultCacheSize=0)
+	with pytest.raises(InterruptException) as err:
+		pl.CountPrimesInRange(10 ** 12, 10 ** 12 + 10 ** 7, cancel=CancelAfter(2))
+	assert 0 < err.value.partial < pl.CountPrimesInRange(10 ** 12, 10 ** 12 + 10 ** 7)
+
+@pytest.mark.parametrize("call", [
+	lambda pl, token: pl.UpdatePrimesToValue(10 ** 10, workers=2, cancel=token),
+	lambda pl, token: pl.CountPrimesInRange(10 ** 12, 10 ** 12 + 10 ** 9, workers=2, cancel=token),
+	lambda pl, token: list(pl.GetPrimeFactorsBatch([(10 ** 18 + 9) * (10 ** 18 + 31)] * 8, workers=2, cancel=token)),
+])
+def test_cancelled_worker_pool_shuts_down_promptly(call):
+	started = time.perf_counter()
+	with pytest.raises(InterruptException):
+		call(PrimeList(resultCacheSize=0), CancelAfter(5))
+	# Queued blocks are dropped instead of run to completion
+	assert time.perf_counter() - started < 10
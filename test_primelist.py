@@ -0,0 +1,635 @@
+"""Tests for the primelist engine: python -m pytest"""
+from array import array
+import bisect
+import math
+import os
+import struct
+import subprocess
+import sys
+
+import pytest
+
+from primelist import FactorPool, PrimeList, ResultCache, WheelStore
+import primelist.cli as cli
+import primelist.core as core
+from primelist.core import (CACHE_FILE, CACHE_HEADER, CACHE_MAGIC, CACHE_MAGIC_V1, LEGACY_CACHE_FILE,
+	PI_INDEX_FILE, RECORD_SIZE, RESULT_CACHE_FILE, SPORADIC_FILE)
+
+LIMIT = 20000
+
+def plain_sieve(limit):
+	flags = bytearray([1]) * (limit + 1)
+	flags[:2] = b"\x00\x00"
+	for p in range(2, int(limit ** 0.5) + 1):
+		if flags[p]:
+			flags[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+	return [i for i, flag in enumerate(flags) if flag]
+
+PRIMES = plain_sieve(LIMIT)
+
+def fresh_list(**kwargs):
+	return PrimeList(resultCacheSize=0, **kwargs)
+
+def write_cache(bound):
+	with fresh_list() as pl:
+		pl.UpdatePrimesToValue(bound)
+
+def stored_primes(pl):
+	return list(pl._list)
+
+# Cache migration
+
+def test_text_cache_is_migrated():
+	stray = 10 ** 20 + 39
+	with open(LEGACY_CACHE_FILE, 'w') as f:
+		f.write("\n".join(map(str, PRIMES + [stray])) + "\n")
+	with fresh_list() as pl:
+		assert pl.GetVerifiedBound() == PRIMES[-1]
+		assert stored_primes(pl) == PRIMES
+		assert pl.IsInPrimeList(stray)
+	
+	with open(CACHE_FILE, 'rb') as f:
+		assert f.read(len(CACHE_MAGIC)) == CACHE_MAGIC
+	pl = fresh_list()
+	assert pl.StoredBound() == PRIMES[-1]
+	assert stored_primes(pl) == PRIMES
+	assert pl.IsInPrimeList(stray)
+
+def test_v1_header_is_read_and_rewritten():
+	with open(CACHE_FILE, 'wb') as f:
+		f.write(struct.pack("<8sQ", CACHE_MAGIC_V1, len(PRIMES)))
+		f.write(array('Q', PRIMES).tobytes())
+	with fresh_list() as pl:
+		assert pl.StoredBound() == PRIMES[-1]
+		assert pl.GetVerifiedBound() == PRIMES[-1]
+		assert stored_primes(pl) == PRIMES
+	
+	with open(CACHE_FILE, 'rb') as f:
+		magic, count, bound = CACHE_HEADER.unpack(f.read(CACHE_HEADER.size))
+	assert (magic, count, bound) == (CACHE_MAGIC, len(PRIMES), PRIMES[-1])
+	assert stored_primes(fresh_list()) == PRIMES
+
+def write_legacy_cache(kind, values):
+	if kind == "text":
+		with open(LEGACY_CACHE_FILE, 'w') as f:
+			f.write("\n".join(map(str, values)) + "\n")
+	else:
+		with open(CACHE_FILE, 'wb') as f:
+			f.write(struct.pack("<8sQ", CACHE_MAGIC_V1, len(values)))
+			f.write(array('Q', values).tobytes())
+
+@pytest.mark.parametrize("kind", ["text", "v1"])
+@pytest.mark.parametrize("bitmap", [False, True])
+def test_stray_lookup_in_an_old_cache_is_not_trusted(kind, bitmap):
+	# The old next/previous prime search appended 1511 to the primes up to 1000
+	write_legacy_cache(kind, PRIMES[:bisect.bisect_right(PRIMES, 1000)] + [1511])
+	with fresh_list(bitmap=bitmap) as pl:
+		assert pl.CountPrimesInRange(1, 1511) == 240
+		assert pl.FindNextPrime(1000) == 1009
+		assert not pl.IsPrime(1009 * 1013)
+		assert pl.IsInPrimeList(1009) and pl.IsInPrimeList(1511)
+		assert pl.GetVerifiedBound() == 1511
+		assert stored_primes(pl) == PRIMES[:240]
+	assert stored_primes(fresh_list(bitmap=bitmap)) == PRIMES[:240]
+
+@pytest.mark.parametrize("kind", ["text", "v1"])
+def test_old_cache_with_a_hole_is_sieved_again(kind):
+	# The old sieve resumed after a stray, skipping every prime between 1000 and it, and once
+	# recorded a composite; a far lookup past the sieved primes is kept in the side index
+	values = [p for p in PRIMES if p <= 1000 or p >= 1511] + [10 ** 12 + 39]
+	values.insert(5, 15)
+	write_legacy_cache(kind, values)
+	with fresh_list() as pl:
+		assert pl.GetVerifiedBound() == PRIMES[-1]
+		assert stored_primes(pl) == PRIMES
+		assert pl.FindPreviousPrime(10 ** 12 + 40) == 10 ** 12 + 39
+		assert pl._coveredLows == [10 ** 12 + 39]
+	assert stored_primes(fresh_list()) == PRIMES
+
+# Primality
+
+# Strong pseudoprimes to the first few prime bases, Carmichael numbers and strong Lucas pseudoprimes
+PSEUDOPRIMES = [
+	2047, 3277, 4033, 4681, 8321, 1373653, 25326001, 3215031751, 2152302898747, 3474749660383,
+	341550071728321, 3825123056546413051, 318665857834031151167461, 3317044064679887385961981,
+	561, 1105, 1729, 2465, 2821, 6601, 8911, 41041, 825265, 321197185, 5394826801, 232250619601,
+	9746347772161, 5459, 5777, 10877, 16109, 18971,
+]
+PRIMES_LARGE = [
+	10000019, 1000000007, 1000000000039, 2 ** 61 - 1, 2 ** 89 - 1, 2 ** 127 - 1, 2 ** 521 - 1,
+	10 ** 24 + 7, 10 ** 50 + 151,
+]
+
+@pytest.mark.parametrize("n", PSEUDOPRIMES)
+def test_pseudoprimes_are_composite(n):
+	pl = fresh_list()
+	assert not pl.IsPrimeLarge(n)
+	assert not pl.BailliePSWTest(n)
+	if n < 3317044064679887385961981:
+		assert not pl.MillerRabinTest(n)
+	if n < 10000000:
+		assert not pl.IsPrime(n)
+
+@pytest.mark.parametrize("n", PRIMES_LARGE)
+def test_primes_are_prime(n):
+	pl = fresh_list()
+	assert pl.IsPrimeLarge(n)
+	assert pl.BailliePSWTest(n)
+	if n < 3317044064679887385961981:
+		assert pl.MillerRabinTest(n)
+
+def test_products_of_large_primes_are_composite():
+	pl = fresh_list()
+	for p, q in ((2 ** 31 - 1, 2 ** 61 - 1), (1000000007, 1000000009), (2 ** 89 - 1, 2 ** 127 - 1)):
+		assert not pl.IsPrimeLarge(p * q)
+
+def test_is_prime_large_matches_a_plain_sieve():
+	pl = fresh_list()
+	primes = set(PRIMES)
+	assert [n for n in range(LIMIT + 1) if pl.IsPrimeLarge(n)] == PRIMES
+	assert all(pl.IsPrime(n) == (n in primes) for n in range(LIMIT + 1))
+
+# Factorization
+
+def test_rho_splits_a_semiprime():
+	pl = fresh_list()
+	n = 1000000007 * 1000000009
+	assert pl.PollardRhoBrent(n) in (1000000007, 1000000009)
+
+def test_ecm_splits_a_semiprime_rho_gives_up_on():
+	pl = fresh_list()
+	p, q = 1000000000039, 1000000000000037
+	assert pl.PollardRhoBrent(p * q) is None
+	assert pl.EcmFactor(p * q) in (p, q)
+
+@pytest.mark.parametrize("factors", [
+	[2, 2, 2, 3, 5, 7, 7],
+	[65537, 65539],
+	[1000000007, 1000000009],
+	[3, 1000000000039, 1000000000000037],
+	[1000000007, 1000000007, 1000000007],
+	[2 ** 31 - 1, 2 ** 61 - 1],
+	[2 ** 89 - 1],
+])
+def test_factors_multiply_back(factors):
+	pl = fresh_list()
+	assert pl.GetPrimeFactors(math.prod(factors)) == factors
+
+def test_factors_match_trial_division():
+	pl = fresh_list()
+	primes = set(PRIMES)
+	for n in range(2, 5000):
+		factors = pl.GetPrimeFactors(n)
+		assert math.prod(factors) == n and factors == sorted(factors)
+		assert all(p in primes for p in factors)
+
+# Prime counting
+
+PI = {10: 4, 100: 25, 1000: 168, 10 ** 4: 1229, 10 ** 5: 9592, 10 ** 6: 78498, 10 ** 7: 664579,
+	10 ** 8: 5761455, 10 ** 9: 50847534, 10 ** 10: 455052511, 2 ** 32: 203280221}
+
+@pytest.fixture(params=["numpy", "python"])
+def numpy_mode(request, monkeypatch):
+	if request.param == "numpy":
+		pytest.importorskip("numpy")
+	else:
+		monkeypatch.setattr(core, "_NumPy", lambda: None)
+	return request.param
+
+@pytest.mark.parametrize("x", sorted(PI))
+def test_lucy_pi_matches_known_values(x, numpy_mode):
+	if numpy_mode == "python" and x > 10 ** 8:
+		pytest.skip("too slow without NumPy")
+	assert fresh_list().CountPrimesUpTo(x) == PI[x]
+
+def test_lucy_pi_matches_a_plain_sieve(numpy_mode):
+	pl = fresh_list()
+	for x in list(range(0, 200)) + list(range(LIMIT - 50, LIMIT + 1)):
+		assert pl.CountPrimesUpTo(x) == bisect.bisect_right(PRIMES, x)
+
+def test_range_counts_match_a_plain_sieve():
+	pl = fresh_list()
+	for start, end in ((0, 1), (2, 2), (1, 100), (90, 97), (1000, LIMIT), (7919, 7919), (500, 400)):
+		assert pl.CountPrimesInRange(start, end) == len([p for p in PRIMES if start <= p <= end])
+
+def test_long_range_counts_by_pi():
+	pl = fresh_list()
+	assert pl.CountPrimesInRange(1, 10 ** 9) == PI[10 ** 9]
+	assert pl.CountPrimesInRange(10 ** 6, 10 ** 9) == PI[10 ** 9] - PI[10 ** 6]
+	# Sieved: short against the cost of pi
+	assert pl.CountPrimesInRange(10 ** 9 - 10 ** 6, 10 ** 9 + 10 ** 6) == pl.CountPrimesUpTo(10 ** 9 + 10 ** 6) - pl.CountPrimesUpTo(10 ** 9 - 10 ** 6 - 1)
+
+# Batch primality
+
+BATCH_VALUES = (list(range(-5, 3000)) + PSEUDOPRIMES + PRIMES_LARGE + [p * q for p in PRIMES_LARGE[:4] for q in PRIMES_LARGE[:4]]
+	+ list(range(10 ** 12, 10 ** 12 + 500)) + [2 ** 63 - 25, 2 ** 63 + 1, 2 ** 64 - 59])
+
+@pytest.mark.parametrize("sieved", [0, LIMIT])
+def test_batch_matches_is_prime_large(sieved, numpy_mode):
+	pl = fresh_list()
+	pl.UpdatePrimesToValue(sieved)
+	expected = [n >= 2 and pl.IsPrimeLarge(n) for n in BATCH_VALUES]
+	assert list(pl.IsPrimeBatch(BATCH_VALUES)) == expected
+	assert pl.IsPrimeMany([n for n in BATCH_VALUES if n >= 0]) == [e for n, e in zip(BATCH_VALUES, expected) if n >= 0]
+
+def test_batch_keeps_input_order_across_chunks():
+	pl = fresh_list()
+	pl.UpdatePrimesToValue(1000)
+	values = [(i * 7919) % 5000 for i in range(3 * core.BATCH_SIZE + 5)]
+	primes = set(PRIMES)
+	assert list(pl.IsPrimeBatch(iter(values))) == [n in primes for n in values]
+
+def test_batch_command_streams_results(tmp_path, capsys):
+	source = tmp_path / "numbers.txt"
+	source.write_text("7\n\n8\nseven\n1000000007\n")
+	assert cli.run_batch(fresh_list(), str(source)) == 0
+	assert capsys.readouterr().out == "7 True\n8 False\nseven invalid\n1000000007 True\n"
+
+# Crash recovery
+
+def test_uncommitted_append_is_dropped():
+	write_cache(10000)
+	committed = os.path.getsize(CACHE_FILE)
+	# A crash after the records were written but before the header committed them
+	with open(CACHE_FILE, 'ab') as f:
+		f.write(array('Q', [10007, 10009, 10037]).tobytes())
+		f.write(b"\x01\x02\x03")
+
+	pl = fresh_list()
+	assert pl.GetVerifiedBound() == 10000
+	assert stored_primes(pl) == PRIMES[:bisect.bisect_right(PRIMES, 10000)]
+
+	# The next save writes over the stray bytes
+	pl.UpdatePrimesToValue(LIMIT)
+	pl.Save()
+	assert os.path.getsize(CACHE_FILE) == committed + (len(PRIMES) - bisect.bisect_right(PRIMES, 10000)) * RECORD_SIZE
+	assert stored_primes(fresh_list()) == PRIMES
+
+def test_header_past_the_end_of_the_file_is_recovered():
+	write_cache(10000)
+	count = bisect.bisect_right(PRIMES, 10000)
+	# The header committed records that never reached the disk, the last one only in part
+	with open(CACHE_FILE, 'r+b') as f:
+		f.truncate(CACHE_HEADER.size + (count - 5) * RECORD_SIZE + 3)
+
+	pl = fresh_list()
+	assert stored_primes(pl) == PRIMES[:count - 5]
+	assert pl.GetVerifiedBound() == PRIMES[count - 6]
+	pl.UpdatePrimesToValue(LIMIT)
+	pl.Save()
+	assert stored_primes(fresh_list()) == PRIMES
+
+def test_truncated_header_fails_to_load():
+	write_cache(1000)
+	with open(CACHE_FILE, 'r+b') as f:
+		f.truncate(CACHE_HEADER.size - 4)
+	with pytest.raises(Exception):
+		fresh_list().GetVerifiedBound()
+
+@pytest.mark.parametrize("checkpoints", [False, True])
+def test_checkpoints_save_during_a_sieve_only_when_enabled(checkpoints, monkeypatch):
+	monkeypatch.setattr(core, "CHECKPOINT_INTERVAL", 0.0)
+	pl = fresh_list(checkpoints=checkpoints)
+	pl.UpdatePrimesToValue(3 * core.SEGMENT_SIZE)
+	# Nothing was saved explicitly; a checkpoint commits every segment sieved so far
+	assert pl.StoredBound() == (3 * core.SEGMENT_SIZE if checkpoints else 0)
+	assert os.path.exists(CACHE_FILE) == checkpoints
+
+# Side index
+
+def test_side_index_is_absorbed_when_the_sieve_reaches_it():
+	with fresh_list() as pl:
+		pl.UpdatePrimesToValue(1000)
+		# Lookups past the sieved range go to the side index, not the store
+		assert pl.FindNextPrime(5000) == 5003
+		assert pl.FindPreviousPrime(9000) == 8999
+		assert pl.GetVerifiedBound() == 1000
+		assert pl.IsInPrimeList(5003) and pl.IsInPrimeList(8999)
+		assert 5003 not in pl._list
+
+	pl = fresh_list()
+	assert pl.StoredBound() == 1000
+	assert pl.GetVerifiedBound() == 1000
+	assert pl._coveredLows == [5001, 8999]
+	pl.UpdatePrimesToValue(LIMIT)
+	assert pl._coveredLows == [] and pl._sporadic == []
+	assert stored_primes(pl) == PRIMES
+	pl.Save()
+	with open(SPORADIC_FILE) as f:
+		assert f.read() == ""
+
+def test_side_index_touching_the_bound_extends_it():
+	pl = fresh_list()
+	pl.UpdatePrimesToValue(1000)
+	# Nothing between 1000 and 1009 is prime, so the sieved range now reaches 1009
+	assert pl.FindNextPrime(1000) == 1009
+	assert pl.GetVerifiedBound() == 1009
+	assert pl._list[-1] == 1009
+	assert pl._coveredLows == []
+
+def read_lines(path):
+	with open(path) as f:
+		return f.read().splitlines()
+
+def test_side_index_is_appended_to():
+	with fresh_list() as pl:
+		assert pl.FindNextPrime(10 ** 12) == 1000000000039
+	first = read_lines(SPORADIC_FILE)
+	assert first == ["1000000000001 1000000000039 1000000000039"]
+	inode = os.stat(SPORADIC_FILE).st_ino
+	
+	with fresh_list() as pl:
+		assert pl.FindNextPrime(10 ** 12) == 1000000000039
+	# Nothing new, nothing written
+	assert read_lines(SPORADIC_FILE) == first
+	with fresh_list() as pl:
+		assert pl.FindPreviousPrime(10 ** 15) == 999999999999989
+	assert read_lines(SPORADIC_FILE) == first + ["999999999999989 1000000000000000 999999999999989"]
+	assert os.stat(SPORADIC_FILE).st_ino == inode
+
+def test_side_index_is_rewritten_once_mostly_stale():
+	with fresh_list() as pl:
+		# Each lookup starts where the last one's interval ends, so they all merge into one
+		prime = 10 ** 12
+		for _ in range(4):
+			prime = pl.FindNextPrime(prime)
+		assert pl._coveredLows == [10 ** 12 + 1] and prime == 1000000000091
+	assert read_lines(SPORADIC_FILE) == ["1000000000001 1000000000091 1000000000039 1000000000061 1000000000063 1000000000091"]
+	assert fresh_list().FindNextPrime(1000000000062) == 1000000000063
+
+def test_torn_side_index_line_is_dropped():
+	with fresh_list() as pl:
+		pl.FindNextPrime(10 ** 12)
+		pl.FindNextPrime(10 ** 15)
+	with open(SPORADIC_FILE, 'r+') as f:
+		f.truncate(len(f.readline()) + 9)
+	
+	with fresh_list() as pl:
+		pl.GetVerifiedBound()
+		assert pl._coveredLows == [10 ** 12 + 1]
+		assert pl.FindNextPrime(10 ** 18) == 10 ** 18 + 3
+	assert read_lines(SPORADIC_FILE) == ["1000000000001 1000000000039 1000000000039",
+		"1000000000000000001 1000000000000000003 1000000000000000003"]
+
+def test_side_index_drops_its_oldest_intervals(monkeypatch):
+	monkeypatch.setattr(core, "SPORADIC_LIMIT", 8)
+	starts = [10 ** 12 + 1000 * i for i in range(9)]
+	with fresh_list() as pl:
+		answers = [pl.FindNextPrime(start) for start in starts]
+		# The ninth interval pushed out the two oldest
+		assert pl._coveredLows == [start + 1 for start in starts[2:]]
+		assert pl._sporadic == answers[2:]
+	assert len(read_lines(SPORADIC_FILE)) == 7
+	pl = fresh_list()
+	assert [pl.FindNextPrime(start) for start in starts] == answers
+
+# Result cache
+
+def test_result_cache_evicts_the_least_recently_used():
+	cache = ResultCache(2)
+	cache.Put("next", 1, 2)
+	cache.Put("next", 2, 3)
+	assert cache.Get("next", 1) == 2
+	cache.Put("next", 3, 5)
+	assert cache.Get("next", 2) is None
+	assert cache.Get("next", 1) == 2 and cache.Get("next", 3) == 5
+	assert cache.Stats() == {"size": 2, "maxSize": 2, "hits": 3, "misses": 1}
+
+def test_result_cache_of_size_zero_keeps_nothing():
+	cache = ResultCache(0)
+	cache.Put("next", 1, 2)
+	assert cache.Get("next", 1) is None
+	assert cache.Stats()["size"] == 0
+
+def test_result_cache_answers_cannot_be_changed_by_callers():
+	cache = ResultCache(4)
+	factors = [3, 5]
+	cache.Put("factors", 15, factors)
+	factors.append(7)
+	cache.Get("factors", 15).append(11)
+	assert cache.Get("factors", 15) == [3, 5]
+
+def test_result_cache_is_persisted_in_order(workdir):
+	cache = ResultCache(3, str(workdir / RESULT_CACHE_FILE))
+	for arg in range(4):
+		cache.Put("next", arg, arg + 1)
+	cache.Get("next", 1)
+	cache.Save()
+	
+	loaded = ResultCache(3, str(workdir / RESULT_CACHE_FILE))
+	assert [loaded.Get("next", arg) for arg in range(4)] == [None, 2, 3, 4]
+	# Reloading keeps the recency order: 1 was used last, so 2 goes first
+	loaded = ResultCache(3, str(workdir / RESULT_CACHE_FILE))
+	loaded.Put("next", 9, 10)
+	assert loaded.Get("next", 2) is None and loaded.Get("next", 1) == 2
+
+def test_small_and_side_indexed_answers_stay_out_of_the_result_cache():
+	pl = PrimeList(resultCacheSize=2)
+	n = 1000000007 * 1000000009
+	assert pl.GetPrimeFactors(n) == [1000000007, 1000000009]
+	for start in (100, 10 ** 6, 10 ** 12, 10 ** 15):
+		pl.FindNextPrime(start)
+		pl.FindPreviousPrime(start)
+	pl.GetPrimeFactors(1001)
+	# Lookups are in the side index and 1001 is below the cache's minimum, so the factors are the only entry
+	assert pl.ResultCacheStats()["size"] == 1
+	assert pl.GetPrimeFactors(n) == [1000000007, 1000000009]
+	assert pl.ResultCacheStats()["hits"] == 1
+
+def test_damaged_result_file_is_ignored(workdir):
+	(workdir / RESULT_CACHE_FILE).write_text("[[\"next\", 1")
+	cache = ResultCache(3, str(workdir / RESULT_CACHE_FILE))
+	assert cache.Get("next", 1) is None
+	cache.Put("next", 1, 2)
+	cache.Save()
+	assert ResultCache(3, str(workdir / RESULT_CACHE_FILE)).Get("next", 1) == 2
+
+def test_large_answers_are_kept_between_runs():
+	n = 1000000007 * 1000000009
+	with PrimeList(persistResults=True) as pl:
+		assert pl.GetPrimeFactors(n) == [1000000007, 1000000009]
+		assert pl.IsPrimeLarge(2 ** 61 - 1) and not pl.IsPrimeLarge(2 ** 61 + 1)
+	
+	pl = PrimeList(persistResults=True)
+	assert pl.GetPrimeFactors(n) == [1000000007, 1000000009]
+	assert pl.IsPrimeLarge(2 ** 61 - 1) and not pl.IsPrimeLarge(2 ** 61 + 1)
+	# Factors and the prime are cache hits; composites are not worth an entry
+	assert pl.ResultCacheStats()["hits"] == 2
+
+# Wheel bitmap
+
+def check_wheel_store(store, primes, limit):
+	assert len(store) == len(primes)
+	assert list(store) == primes
+	assert store[-1] == primes[-1]
+	assert list(store[100:2100]) == primes[100:2100]
+	for val in range(-2, limit + 40):
+		rank = bisect.bisect_left(primes, val)
+		assert store.bisect_left(val) == rank
+		assert (val in store) == (rank < len(primes) and primes[rank] == val)
+		after = bisect.bisect_right(primes, val)
+		assert store.NextAbove(val) == (primes[after] if after < len(primes) else None)
+		assert store.PreviousAtMost(val) == (primes[after - 1] if after else None)
+	for index in range(0, len(primes), 7):
+		assert store[index] == primes[index]
+
+def test_wheel_store_matches_a_plain_sieve():
+	check_wheel_store(WheelStore(PRIMES), PRIMES, LIMIT)
+
+def test_mapped_wheel_store_matches_a_plain_sieve():
+	# Saved in steps, so the mapped file is appended to and remapped
+	for bound in (997, 1000, 12345, LIMIT):
+		with fresh_list(bitmap=True) as pl:
+			pl.UpdatePrimesToValue(bound)
+	store = fresh_list(bitmap=True)._list
+	assert len(store._base) > 0
+	check_wheel_store(store, PRIMES, LIMIT)
+
+def test_binary_cache_is_converted_to_a_bitmap():
+	write_cache(LIMIT)
+	before = os.path.getsize(CACHE_FILE)
+	with fresh_list(bitmap=True) as pl:
+		assert isinstance(pl._list, WheelStore)
+		assert pl.CountPrimesInRange(1000, LIMIT) == len(PRIMES) - bisect.bisect_left(PRIMES, 1000)
+	assert os.path.getsize(CACHE_FILE) == before
+	pl = fresh_list(bitmap=True)
+	assert pl.StoredBound() == LIMIT
+	assert stored_primes(pl) == PRIMES
+
+# Gaps and prime pairs
+
+def expected_gap_stats(primes, start, end):
+	inside = [p for p in primes if start <= p <= end]
+	histogram, first = {}, {}
+	for p, q in zip(inside, inside[1:]):
+		histogram[q - p] = histogram.get(q - p, 0) + 1
+		first.setdefault(q - p, p)
+	found = set(inside)
+	pairs = {k: sum(1 for p in inside if p + k in found) for k in (2, 4, 6)}
+	return inside, dict(sorted(histogram.items())), dict(sorted(first.items())), pairs
+
+@pytest.mark.parametrize("start, end", [(1, LIMIT), (1000, 1100), (7000, LIMIT - 3), (24, 28)])
+@pytest.mark.parametrize("sieved", [0, LIMIT])
+def test_gap_stats_match_a_plain_sieve(start, end, sieved, numpy_mode):
+	pl = fresh_list()
+	pl.UpdatePrimesToValue(sieved)
+	inside, histogram, first, pairs = expected_gap_stats(PRIMES, start, end)
+	stats = pl.PrimeGapStats(start, end)
+	assert stats["primes"] == len(inside)
+	assert stats["histogram"] == histogram and stats["firstOccurrence"] == first
+	assert (stats["twins"], stats["cousins"], stats["sexy"]) == (pairs[2], pairs[4], pairs[6])
+	if inside:
+		assert (stats["first"], stats["last"]) == (inside[0], inside[-1])
+	if histogram:
+		assert stats["maxGap"] == max(histogram) and stats["maxGapAfter"] == first[max(histogram)]
+	found = set(inside)
+	for k in (2, 4, 6, 8, 30):
+		assert pl.CountPrimePairs(start, end, k) == sum(1 for p in inside if p + k in found)
+
+def test_gap_stats_across_segments(numpy_mode):
+	# Gaps and pairs that straddle sieve segments are still counted once
+	stats = fresh_list().PrimeGapStats(1, 10 ** 6)
+	assert stats["primes"] == PI[10 ** 6]
+	assert stats["twins"] == 8169
+	assert stats["maxGap"] == 114 and stats["maxGapAfter"] == 492113
+	assert sum(stats["histogram"].values()) == PI[10 ** 6] - 1
+
+@pytest.mark.parametrize("gap, prime", [(1, 2), (2, 3), (4, 7), (6, 23), (8, 89), (14, 113), (72, 31397), (100, 396733), (112, 370261)])
+def test_first_gap(gap, prime):
+	assert fresh_list().FindPrimeGap(gap) == prime
+
+def test_first_gap_within_bounds():
+	pl = fresh_list()
+	assert pl.FindPrimeGap(3) is None
+	assert pl.FindPrimeGap(72, 1, 31397 + 71) is None
+	assert pl.FindPrimeGap(72, 1, 31397 + 72) == 31397
+	assert pl.FindPrimeGap(2, 100) == 101
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_gap_scans_leave_the_cache_alone(workers):
+	with fresh_list() as pl:
+		pl.UpdatePrimesToValue(1000)
+		stored = len(pl._list)
+		# Starting where the cache stops, so the scan could have extended it
+		assert pl.PrimeGapStats(1, 3 * core.SEGMENT_SIZE, workers=workers)["primes"] == pl.CountPrimesUpTo(3 * core.SEGMENT_SIZE)
+		assert pl.CountPrimePairs(1001, 10 ** 6, 2, workers=workers) == 8169 - 35
+		assert pl.FindPrimeGap(100) == 396733
+		assert len(pl._list) == stored and pl.GetVerifiedBound() == 1000
+	assert fresh_list().StoredBound() == 1000
+
+def test_gap_report_into_a_closed_pipe_stops_quietly():
+	script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "find_primes.py")
+	proc = subprocess.Popen([sys.executable, script, "--gaps", "1", "100000", "--histogram"],
+		stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+	# The reader is gone before anything is written, as when head has had its lines
+	proc.stdout.close()
+	errors = proc.stderr.read().decode()
+	proc.wait(60)
+	assert "Error" not in errors and "Traceback" not in errors
+
+# Nth prime and pi(x)
+
+NTH = {1: 2, 10: 29, 100: 541, 1000: 7919, 10 ** 4: 104729, 10 ** 5: 1299709, 10 ** 6: 15485863,
+	10 ** 7: 179424673, 10 ** 8: 2038074743}
+
+@pytest.mark.parametrize("sieved", [0, LIMIT])
+def test_nth_prime_and_pi_match_a_plain_sieve(sieved):
+	pl = fresh_list()
+	pl.UpdatePrimesToValue(sieved)
+	assert pl.NthPrime(0) is None and pl.PrimePi(1) == 0
+	for n in list(range(1, 60)) + list(range(len(PRIMES) - 60, len(PRIMES) + 1)):
+		assert pl.NthPrime(n) == PRIMES[n - 1]
+	for x in list(range(0, 200)) + list(range(LIMIT - 200, LIMIT + 1)):
+		assert pl.PrimePi(x) == bisect.bisect_right(PRIMES, x)
+
+@pytest.mark.parametrize("n", sorted(NTH))
+def test_nth_prime_matches_known_values(n):
+	pl = fresh_list()
+	assert pl.NthPrime(n) == NTH[n]
+	assert pl.PrimePi(NTH[n]) == n and pl.PrimePi(NTH[n] - 1) == n - 1
+
+def test_pi_checkpoints_are_kept_between_runs(monkeypatch):
+	with fresh_list() as pl:
+		assert pl.PrimePi(10 ** 9) == PI[10 ** 9]
+		assert pl.NthPrime(10 ** 7) == NTH[10 ** 7]
+	with open(PI_INDEX_FILE) as f:
+		# NthPrime also leaves the count at its estimate
+		assert {(10 ** 9, PI[10 ** 9]), (NTH[10 ** 7], 10 ** 7)} <= {tuple(map(int, line.split())) for line in f}
+	
+	# Near a checkpoint, both are a short sieve away instead of a full prime count
+	pl = fresh_list()
+	monkeypatch.setattr(pl, "CountPrimesUpTo", None)
+	assert pl.PrimePi(10 ** 9 + 10 ** 5) == PI[10 ** 9] + pl.CountPrimesInRange(10 ** 9 + 1, 10 ** 9 + 10 ** 5)
+	assert pl.PrimePi(NTH[10 ** 7]) == 10 ** 7
+	assert pl.NthPrime(10 ** 7 + 1) == pl.FindNextPrime(NTH[10 ** 7])
+
+def test_primes_between_matches_a_plain_sieve():
+	pl = fresh_list()
+	pl.UpdatePrimesToValue(5000)
+	assert pl.PrimesBetween(1000, LIMIT) == [p for p in PRIMES if 1000 <= p <= LIMIT]
+	assert pl.PrimesBetween(10, 10) == []
+
+# Batch factorization
+
+FACTOR_VALUES = (list(range(-2, 3000)) + PSEUDOPRIMES + PRIMES_LARGE[:6] + [65537 * 65539, 65537 ** 2, 2 ** 64 - 1,
+	1000000007 * 1000000009, 1000000000039 * 1000000000000037, 3 * 5 * 1000000007 ** 2])
+
+def test_batch_factors_match_get_prime_factors():
+	pl = fresh_list()
+	expected = [pl.GetPrimeFactors(n) for n in FACTOR_VALUES]
+	assert list(fresh_list().GetPrimeFactorsBatch(FACTOR_VALUES)) == expected
+
+def test_batch_factors_on_a_shared_pool():
+	pl = fresh_list()
+	values = [1000000007 * 1000000009, 12, 1000000000039 * 1000000000000037, 97]
+	expected = [pl.GetPrimeFactors(n) for n in values]
+	with FactorPool(2) as pool:
+		for _ in range(2):
+			assert list(fresh_list().GetPrimeFactorsBatch(values, pool=pool)) == expected
+	assert list(fresh_list().GetPrimeFactorsBatch(values, workers=2)) == expected
+
+def test_batch_command_prints_factors(tmp_path, capsys):
+	source = tmp_path / "numbers.txt"
+	source.write_text("7\n\n8\nseven\n1000000007\n1000000016000000063\n")
+	assert cli.run_batch(fresh_list(), str(source), factors=True, workers=2) == 0
+	assert capsys.readouterr().out == "7 [7]\n8 [2, 2, 2]\nseven invalid\n1000000007 [1000000007]\n1000000016000000063 [1000000007, 1000000009]\n"
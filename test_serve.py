@@ -0,0 +1,110 @@
+"""Tests for --serve mode: python -m pytest"""
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from primelist import CancelToken, PrimeList
+from primelist.cli import serve
+
+ADDRESS = "serve.sock"
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+@pytest.fixture
+def server():
+	"""A server on a Unix socket in the test directory, stopped after the test"""
+	pl = PrimeList(resultCacheSize=16)
+	cancel = CancelToken()
+	thread = threading.Thread(target=serve, args=(pl, ADDRESS, cancel))
+	thread.start()
+	deadline = time.time() + 10
+	while not os.path.exists(ADDRESS):
+		assert time.time() < deadline, "server did not start"
+		time.sleep(0.01)
+	yield pl
+	cancel.Cancel()
+	thread.join(10)
+	assert not thread.is_alive()
+
+class Client():
+	def __init__(self):
+		self.sock = socket.socket(socket.AF_UNIX)
+		self.sock.settimeout(10)
+		self.sock.connect(ADDRESS)
+		self.lines = self.sock.makefile('r')
+	
+	def send(self, request):
+		self.sock.sendall(((request if isinstance(request, str) else json.dumps(request)) + "\n").encode())
+	
+	def receive(self):
+		return json.loads(self.lines.readline())
+	
+	def ask(self, request):
+		self.send(request)
+		return self.receive()
+	
+	def close(self):
+		self.lines.close()
+		self.sock.close()
+
+@pytest.fixture
+def client(server):
+	conn = Client()
+	yield conn
+	conn.close()
+
+def test_requests_are_answered(client):
+	assert client.ask({"id": 1, "op": "check", "value": 1000000007}) == {"id": 1, "result": True}
+	assert client.ask({"id": 2, "op": "check", "value": 1000000007 * 3}) == {"id": 2, "result": False}
+	assert client.ask({"id": 3, "op": "next", "value": 10 ** 12}) == {"id": 3, "result": 1000000000039}
+	assert client.ask({"id": 4, "op": "prev", "value": 10 ** 12}) == {"id": 4, "result": 999999999989}
+	assert client.ask({"id": 5, "op": "range", "start": 1, "end": 10 ** 6}) == {"id": 5, "result": 78498}
+	assert client.ask({"id": 6, "op": "factor", "value": 1000000007 * 1000000009}) == {"id": 6, "result": [1000000007, 1000000009]}
+	stats = client.ask({"id": 7, "op": "stats"})["result"]
+	assert stats["maxSize"] == 16 and stats["size"] >= 1
+
+def test_bad_requests_get_an_error(client):
+	assert "error" in client.ask({"id": 1, "op": "divide", "value": 6})
+	assert client.ask({"id": 2, "op": "check"}) == {"id": 2, "error": "Missing field: value"}
+	assert "error" in client.ask({"id": 3, "op": "check", "value": "seven"})
+	assert "error" in client.ask("not json")
+	# The connection survives every one of them
+	assert client.ask({"id": 4, "op": "check", "value": 7}) == {"id": 4, "result": True}
+
+def test_clients_share_the_cache(server):
+	first, second = Client(), Client()
+	try:
+		assert first.ask({"id": 1, "op": "factor", "value": 1000000007 * 1000000009}) == {"id": 1, "result": [1000000007, 1000000009]}
+		# The second client's factorization is a hit on the answer the first one left
+		assert second.ask({"id": 1, "op": "factor", "value": 1000000007 * 1000000009}) == {"id": 1, "result": [1000000007, 1000000009]}
+		assert second.ask({"id": 2, "op": "stats"})["result"]["hits"] == 1
+	finally:
+		first.close()
+		second.close()
+
+def test_handler_failures_get_an_error(client, monkeypatch):
+	# json reads 1e400 as infinity, which int() refuses with OverflowError
+	assert "error" in client.ask('{"id": 1, "op": "range", "start": 1, "end": 1e400}')
+	monkeypatch.setattr(PrimeList, "GetPrimeFactors", lambda self, value, cancel=None: 1 // 0)
+	assert client.ask({"id": 2, "op": "factor", "value": 91}) == {"id": 2, "error": "integer division or modulo by zero"}
+	assert client.ask({"id": 3, "op": "check", "value": 7}) == {"id": 3, "result": True}
+
+def test_a_long_request_does_not_hold_up_other_clients(server):
+	slow, quick = Client(), Client()
+	try:
+		# Two 25-digit factors keep the factorization busy until the server stops, which has to
+		# interrupt it for the fixture to see the server shut down
+		slow.send({"id": 1, "op": "factor", "value": 1000000000000000000000007 * 10000000000000000000000013})
+		time.sleep(0.2)
+		started = time.time()
+		assert quick.ask({"id": 1, "op": "check", "value": 10 ** 12 + 39}) == {"id": 1, "result": True}
+		assert quick.ask({"id": 2, "op": "range", "start": 1, "end": 10 ** 6}) == {"id": 2, "result": 78498}
+		assert quick.ask({"id": 3, "op": "next", "value": 10 ** 12}) == {"id": 3, "result": 1000000000039}
+		assert time.time() - started < 5
+	finally:
+		slow.close()
+		quick.close()